@@ -5,17 +5,133 @@ import queue
 import os
 import re
 import json
+import math
 import time
+import platform
+import hashlib
+import codecs
+import pickle
+import difflib
+import sys
+import argparse
+import socket
+import socketserver
+import select
+import struct
+import mmap
+import ctypes
+import ctypes.util
+import heapq
+import random
+import tempfile
+import tracemalloc
+import array
+import io
+import subprocess
+import http.client
+import urllib.parse
+import hmac
+import secrets
+import asyncio
+import itertools
+import gc
+import cProfile
+import pstats
+import abc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict
 import psutil
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 import argostranslate.package
+import argostranslate.settings
 import argostranslate.translate
+import ctranslate2
 import yaml
 from yaml.representer import SafeRepresenter
 from yaml.constructor import SafeConstructor
 
 
+SNIFF_BYTES = 64 * 1024
+
+# UTF-32 marks are checked first because they start with the UTF-16 ones
+BYTE_ORDER_MARKS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def read_file_prefix(filename, size=SNIFF_BYTES):
+    """Read at most size bytes from the start of a file"""
+    with open(filename, 'rb') as f:
+        return f.read(size)
+
+
+def sniff_encoding(data):
+    """Guess the encoding of a file from its first bytes"""
+    for bom, encoding in BYTE_ORDER_MARKS:
+        if data.startswith(bom):
+            return encoding
+
+    try:
+        # Not final, so a character cut off at the end of the prefix is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(data, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        # Java properties files are ISO-8859-1 unless stated otherwise
+        return 'latin-1'
+
+
+def detect_encoding(filename):
+    """Detect the encoding of a file from a bounded prefix"""
+    return sniff_encoding(read_file_prefix(filename))
+
+
+def detect_file_type(filename):
+    """Auto-detect file type based on extension, then on a bounded prefix of the content"""
+    ext = os.path.splitext(filename)[1].lower()
+    if ext == '.properties':
+        return 'properties'
+    elif ext in ['.yaml', '.yml']:
+        return 'yaml'
+
+    # Try to detect by content
+    try:
+        data = read_file_prefix(filename)
+    except OSError as e:
+        raise Exception(f"Failed to read source file: {e}")
+
+    content = data.decode(sniff_encoding(data), errors='ignore')
+    if '=' in content and not content.strip().startswith(('---', '- ')):
+        return 'properties'
+    return 'yaml'
+
+
+TRANSLATABLE_EXTENSIONS = ('.properties', '.yaml', '.yml')
+
+
+def collect_translatable_files(source_dir, output_dir):
+    """Map every properties/YAML file under a directory to the same relative path in output_dir"""
+    pairs = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in TRANSLATABLE_EXTENSIONS:
+                source = os.path.join(root, name)
+                pairs.append((source, os.path.join(output_dir, os.path.relpath(source, source_dir))))
+    return pairs
+
+
+def get_app_data_dir():
+    """Get the per-user directory used for caches, creating it if needed"""
+    path = os.path.join(os.path.expanduser('~'), '.minecraft_translator')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
 class TranslatorGUI:
     def __init__(self, root):
         self.root = root
@@ -28,12 +144,22 @@ class TranslatorGUI:
         self.output_file = tk.StringVar()
         self.source_lang = tk.StringVar(value="en")
         self.target_lang = tk.StringVar(value="id")
-        self.cpu_usage_mode = tk.StringVar(value="percentage")
+        self.cpu_usage_mode = tk.StringVar(value="auto")
         self.cpu_percentage = tk.IntVar(value=50)
         self.thread_count = tk.IntVar(value=2)
         self.batch_size = tk.IntVar(value=5)
         self.delay_between_requests = tk.DoubleVar(value=0.3)
         self.file_type = tk.StringVar(value="auto")
+        self.skip_target_language = tk.BooleanVar(value=False)
+        self.glossary_file = tk.StringVar()
+        self.key_rules = tk.StringVar()
+        self.fuzzy_match_percent = tk.IntVar(value=0)
+        self.cache_limit_mb = tk.IntVar(value=TranslationCache.DEFAULT_MAX_BYTES // (1024 * 1024))
+        self.memory_budget_mb = tk.IntVar(value=0)
+        self.performance_profile = tk.StringVar(value="default")
+        self.daemon_address = tk.StringVar()
+        # Hidden option, set from settings JSON or toggled with Ctrl+Shift+P
+        self.profiler_mode = tk.StringVar()
 
         # Translation components
         self.translator = None
@@ -46,6 +172,7 @@ class TranslatorGUI:
 
         self.create_widgets()
         self.setup_logging()
+        self.root.bind('<Control-P>', self.toggle_profiler)
 
     def get_available_languages(self):
         """Get available language codes and names"""
@@ -217,6 +344,12 @@ class TranslatorGUI:
                                                                             padx=(0, 5), pady=(5, 0))
         ttk.Button(file_frame, text="Browse", command=self.browse_output_file).grid(row=2, column=2, pady=(5, 0))
 
+        # Glossary file
+        ttk.Label(file_frame, text="Glossary (optional):").grid(row=3, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        ttk.Entry(file_frame, textvariable=self.glossary_file, width=50).grid(row=3, column=1, sticky=(tk.W, tk.E),
+                                                                              padx=(0, 5), pady=(5, 0))
+        ttk.Button(file_frame, text="Browse", command=self.browse_glossary_file).grid(row=3, column=2, pady=(5, 0))
+
     def create_language_section(self, parent):
         """Create language selection section"""
         lang_frame = ttk.LabelFrame(parent, text="Language Settings", padding="10")
@@ -259,8 +392,10 @@ class TranslatorGUI:
         mode_frame = ttk.Frame(cpu_frame)
         mode_frame.grid(row=0, column=1, sticky=(tk.W, tk.E))
 
-        ttk.Radiobutton(mode_frame, text="Percentage", variable=self.cpu_usage_mode, value="percentage").pack(
+        ttk.Radiobutton(mode_frame, text="Auto", variable=self.cpu_usage_mode, value="auto").pack(
             side=tk.LEFT)
+        ttk.Radiobutton(mode_frame, text="Percentage", variable=self.cpu_usage_mode, value="percentage").pack(
+            side=tk.LEFT, padx=(20, 0))
         ttk.Radiobutton(mode_frame, text="Thread Count", variable=self.cpu_usage_mode, value="threads").pack(
             side=tk.LEFT, padx=(20, 0))
 
@@ -288,9 +423,19 @@ class TranslatorGUI:
             side=tk.LEFT)
         ttk.Label(thread_frame, text=f"(Max: {psutil.cpu_count()})").pack(side=tk.LEFT, padx=(10, 0))
 
+        # Model runtime profile
+        ttk.Label(cpu_frame, text="Runtime Profile:").grid(row=3, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        profile_frame = ttk.Frame(cpu_frame)
+        profile_frame.grid(row=3, column=1, sticky=(tk.W, tk.E), pady=(5, 0))
+
+        ttk.Combobox(profile_frame, textvariable=self.performance_profile,
+                     values=list(PerformanceProfile.PRESETS.keys()), state="readonly", width=15).pack(side=tk.LEFT)
+        ttk.Label(profile_frame, text="(fast_draft = int8, beam 1; quality = float32, beam 5)",
+                  foreground="gray").pack(side=tk.LEFT, padx=(10, 0))
+
         # Current CPU info
         cpu_info = f"System: {psutil.cpu_count()} cores, {psutil.cpu_percent()}% usage"
-        ttk.Label(cpu_frame, text=cpu_info, foreground="gray").grid(row=3, column=0, columnspan=2, sticky=tk.W,
+        ttk.Label(cpu_frame, text=cpu_info, foreground="gray").grid(row=4, column=0, columnspan=2, sticky=tk.W,
                                                                     pady=(5, 0))
 
     def create_advanced_section(self, parent):
@@ -310,6 +455,43 @@ class TranslatorGUI:
         ttk.Spinbox(adv_frame, from_=0.1, to=5.0, increment=0.1, textvariable=self.delay_between_requests,
                     width=10).grid(row=0, column=3, sticky=tk.W)
 
+        # Fuzzy translation memory threshold (0 disables fuzzy reuse)
+        ttk.Label(adv_frame, text="Fuzzy Match (%):").grid(row=1, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        ttk.Spinbox(adv_frame, from_=0, to=100, textvariable=self.fuzzy_match_percent, width=10).grid(
+            row=1, column=1, sticky=tk.W, pady=(5, 0))
+        ttk.Label(adv_frame, text="(0 = exact/template matches only)", foreground="gray").grid(
+            row=1, column=2, columnspan=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+
+        # Shared translation cache limit
+        ttk.Label(adv_frame, text="Cache Limit (MB):").grid(row=2, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        ttk.Spinbox(adv_frame, from_=8, to=4096, increment=8, textvariable=self.cache_limit_mb, width=10).grid(
+            row=2, column=1, sticky=tk.W, pady=(5, 0))
+
+        # Memory budget for loaded models and workers
+        ttk.Label(adv_frame, text="Memory Budget (MB):").grid(row=2, column=2, sticky=tk.W, padx=(20, 5), pady=(5, 0))
+        ttk.Spinbox(adv_frame, from_=0, to=262144, increment=256, textvariable=self.memory_budget_mb,
+                    width=10).grid(row=2, column=3, sticky=tk.W, pady=(5, 0))
+
+        # Language pre-filter
+        ttk.Checkbutton(adv_frame, text="Skip text already in target language",
+                        variable=self.skip_target_language).grid(row=3, column=0, columnspan=4, sticky=tk.W,
+                                                                 pady=(5, 0))
+
+        # Optional translation daemon
+        ttk.Label(adv_frame, text="Daemon (optional):").grid(row=4, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        ttk.Entry(adv_frame, textvariable=self.daemon_address, width=25).grid(row=4, column=1, sticky=(tk.W, tk.E),
+                                                                             pady=(5, 0))
+        ttk.Label(adv_frame, text=f"(e.g. {DEFAULT_DAEMON_ADDRESS}; empty = translate in this window)",
+                  foreground="gray").grid(row=4, column=2, columnspan=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+
+        # Key-path rules that limit translation to message-like keys
+        ttk.Label(adv_frame, text="Key Rules (optional):").grid(row=5, column=0, sticky=tk.W, padx=(0, 5), pady=(5, 0))
+        ttk.Entry(adv_frame, textvariable=self.key_rules, width=25).grid(row=5, column=1, sticky=(tk.W, tk.E),
+                                                                        pady=(5, 0))
+        ttk.Label(adv_frame, text=f"(e.g. messages.**, **.lore[*], !database.*; profiles: "
+                                  f"{', '.join('@' + name for name in KeyPathRules.PROFILES)})",
+                  foreground="gray").grid(row=5, column=2, columnspan=2, sticky=tk.W, padx=(20, 0), pady=(5, 0))
+
     def create_control_section(self, parent):
         """Create control buttons section"""
         control_frame = ttk.Frame(parent)
@@ -322,6 +504,12 @@ class TranslatorGUI:
                                       state=tk.DISABLED)
         self.stop_button.pack(side=tk.LEFT, padx=(10, 0))
 
+        self.pause_button = ttk.Button(control_frame, text="Pause", command=self.toggle_pause, state=tk.DISABLED)
+        self.pause_button.pack(side=tk.LEFT, padx=(10, 0))
+
+        self.estimate_button = ttk.Button(control_frame, text="Estimate Cost", command=self.start_estimate)
+        self.estimate_button.pack(side=tk.LEFT, padx=(10, 0))
+
         ttk.Button(control_frame, text="Clear Log", command=self.clear_log).pack(side=tk.RIGHT)
         ttk.Button(control_frame, text="Save Settings", command=self.save_settings).pack(side=tk.RIGHT, padx=(0, 10))
         ttk.Button(control_frame, text="Load Settings", command=self.load_settings).pack(side=tk.RIGHT, padx=(0, 10))
@@ -343,22 +531,7 @@ class TranslatorGUI:
 
     def detect_file_type(self, filename):
         """Auto-detect file type based on extension"""
-        ext = os.path.splitext(filename)[1].lower()
-        if ext == '.properties':
-            return 'properties'
-        elif ext in ['.yaml', '.yml']:
-            return 'yaml'
-        else:
-            # Try to detect by content
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                    if '=' in content and not content.strip().startswith(('---', '- ')):
-                        return 'properties'
-                    else:
-                        return 'yaml'
-            except:
-                return 'properties'  # Default fallback
+        return detect_file_type(filename)
 
     def browse_source_file(self):
         """Browse for source file"""
@@ -391,6 +564,18 @@ class TranslatorGUI:
         if filename:
             self.output_file.set(filename)
 
+    def browse_glossary_file(self):
+        """Browse for glossary term file"""
+        filename = filedialog.askopenfilename(
+            title="Select Glossary File",
+            filetypes=[
+                ("Text files", "*.txt"),
+                ("All files", "*.*")
+            ]
+        )
+        if filename:
+            self.glossary_file.set(filename)
+
     def refresh_languages(self):
         """Refresh available languages"""
         self.available_languages = self.get_available_languages()
@@ -470,11 +655,13 @@ After installing new languages, click 'Refresh Languages' to update the list."""
 
     def calculate_optimal_threads(self):
         """Calculate optimal thread count based on CPU usage setting"""
-        if self.cpu_usage_mode.get() == "percentage":
-            cpu_cores = psutil.cpu_count()
+        if self.cpu_usage_mode.get() == "auto":
+            return WorkerTuning.AUTO
+        elif self.cpu_usage_mode.get() == "percentage":
+            hardware = get_hardware_info()
             target_percentage = self.cpu_percentage.get()
-            optimal_threads = max(1, int(cpu_cores * target_percentage / 100))
-            return min(optimal_threads, cpu_cores)
+            optimal_threads = max(1, int(hardware['physical_cores'] * target_percentage / 100))
+            return min(optimal_threads, WorkerTuning.worker_limit(hardware))
         else:
             return self.thread_count.get()
 
@@ -516,7 +703,16 @@ After installing new languages, click 'Refresh Languages' to update the list."""
             'thread_count': self.thread_count.get(),
             'batch_size': self.batch_size.get(),
             'delay_between_requests': self.delay_between_requests.get(),
-            'file_type': self.file_type.get()
+            'file_type': self.file_type.get(),
+            'skip_target_language': self.skip_target_language.get(),
+            'glossary_file': self.glossary_file.get(),
+            'key_rules': self.key_rules.get(),
+            'fuzzy_match_percent': self.fuzzy_match_percent.get(),
+            'cache_limit_mb': self.cache_limit_mb.get(),
+            'memory_budget_mb': self.memory_budget_mb.get(),
+            'performance_profile': self.performance_profile.get(),
+            'daemon_address': self.daemon_address.get(),
+            'profiler': self.profiler_mode.get()
         }
 
         filename = filedialog.asksaveasfilename(
@@ -547,12 +743,22 @@ After installing new languages, click 'Refresh Languages' to update the list."""
 
                 self.source_lang.set(settings.get('source_lang', 'en'))
                 self.target_lang.set(settings.get('target_lang', 'id'))
-                self.cpu_usage_mode.set(settings.get('cpu_usage_mode', 'percentage'))
+                self.cpu_usage_mode.set(settings.get('cpu_usage_mode', 'auto'))
                 self.cpu_percentage.set(settings.get('cpu_percentage', 50))
                 self.thread_count.set(settings.get('thread_count', 2))
                 self.batch_size.set(settings.get('batch_size', 5))
                 self.delay_between_requests.set(settings.get('delay_between_requests', 0.3))
                 self.file_type.set(settings.get('file_type', 'auto'))
+                self.skip_target_language.set(settings.get('skip_target_language', False))
+                self.glossary_file.set(settings.get('glossary_file', ''))
+                self.key_rules.set(settings.get('key_rules', ''))
+                self.fuzzy_match_percent.set(settings.get('fuzzy_match_percent', 0))
+                self.cache_limit_mb.set(settings.get('cache_limit_mb', TranslationCache.DEFAULT_MAX_BYTES // (1024 * 1024)))
+                self.memory_budget_mb.set(settings.get('memory_budget_mb', 0))
+                self.performance_profile.set(settings.get('performance_profile', 'default'))
+                self.daemon_address.set(settings.get('daemon_address', ''))
+                profiler = settings.get('profiler') or ''
+                self.profiler_mode.set(profiler if profiler in RunProfiler.MODES else '')
 
                 self.log(f"Settings loaded from {filename}")
             except Exception as e:
@@ -572,6 +778,10 @@ After installing new languages, click 'Refresh Languages' to update the list."""
             messagebox.showerror("Error", "Source file does not exist")
             return False
 
+        if self.glossary_file.get() and not os.path.exists(self.glossary_file.get()):
+            messagebox.showerror("Error", "Glossary file does not exist")
+            return False
+
         if self.source_lang.get() not in self.available_languages:
             messagebox.showerror("Error", "Source language not available")
             return False
@@ -592,60 +802,120 @@ After installing new languages, click 'Refresh Languages' to update the list."""
             return
 
         self.is_translating = True
+        self.translator = None
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.NORMAL, text="Pause")
 
         # Calculate optimal threads
         optimal_threads = self.calculate_optimal_threads()
-        self.log(f"Starting translation with {optimal_threads} threads")
+        if optimal_threads == WorkerTuning.AUTO:
+            self.log("Starting translation with auto-tuned threads")
+        else:
+            self.log(f"Starting translation with {optimal_threads} threads")
 
         # Determine file type
-        if self.file_type.get() == "auto":
-            detected_type = self.detect_file_type(self.source_file.get())
-            self.log(f"Auto-detected file type: {detected_type}")
-        else:
-            detected_type = self.file_type.get()
+        detected_type = self.get_selected_file_type()
 
         # Start translation in separate thread
         self.translation_thread = threading.Thread(target=self.run_translation, args=(optimal_threads, detected_type))
         self.translation_thread.daemon = True
         self.translation_thread.start()
 
+    def get_selected_file_type(self):
+        """Get the selected file type, auto-detecting it if needed"""
+        if self.file_type.get() == "auto":
+            detected_type = self.detect_file_type(self.source_file.get())
+            self.log(f"Auto-detected file type: {detected_type}")
+            return detected_type
+        return self.file_type.get()
+
+    def start_estimate(self):
+        """Start a dry run that estimates the translation cost"""
+        if not self.validate_settings():
+            return
+
+        if self.is_translating:
+            messagebox.showwarning("Warning", "Translation is already in progress")
+            return
+
+        detected_type = self.get_selected_file_type()
+        estimate_thread = threading.Thread(target=self.run_estimate, args=(detected_type,))
+        estimate_thread.daemon = True
+        estimate_thread.start()
+
+    def run_estimate(self, file_type):
+        """Run a dry run without loading or calling the model"""
+        try:
+            engine = create_translator_engine(file_type, **self.get_engine_kwargs(self.calculate_optimal_threads()),
+                                              dry_run=True)
+            engine.log_cost_estimate(engine.estimate_cost())
+        except Exception as e:
+            self.log(f"Estimate error: {e}")
+
     def stop_translation(self):
         """Stop translation process"""
         if self.translator:
-            self.translator.stop_translation = True
+            self.translator.request_stop()
         self.log("Translation stop requested...")
 
+    def toggle_pause(self):
+        """Pause or resume the running translation"""
+        if not self.translator:
+            return
+
+        if self.translator.paused:
+            self.translator.resume()
+            self.pause_button.config(text="Pause")
+            self.log("Translation resumed")
+        else:
+            self.translator.pause()
+            self.pause_button.config(text="Resume")
+            self.log("Translation paused, finished work is kept...")
+
+    def toggle_profiler(self, event=None):
+        """Cycle the hidden profiling mode: off, cProfile, sampled stacks"""
+        modes = ('',) + RunProfiler.MODES
+        mode = modes[(modes.index(self.profiler_mode.get()) + 1) % len(modes)]
+        self.profiler_mode.set(mode)
+        if mode:
+            self.log(f"Profiling enabled ({mode}), the profile is saved next to the output file")
+        else:
+            self.log("Profiling disabled")
+
+    def get_engine_kwargs(self, max_workers):
+        """Build translator engine arguments from the current settings"""
+        return dict(
+            source_file=self.source_file.get(),
+            output_file=self.output_file.get(),
+            source_lang=self.source_lang.get(),
+            target_lang=self.target_lang.get(),
+            max_workers=max_workers,
+            # Auto mode tunes the batch size together with the worker count
+            batch_size=WorkerTuning.AUTO if max_workers == WorkerTuning.AUTO else self.batch_size.get(),
+            delay_between_requests=self.delay_between_requests.get(),
+            log_callback=self.log,
+            progress_callback=self.update_progress,
+            skip_target_language=self.skip_target_language.get(),
+            glossary_file=self.glossary_file.get() or None,
+            key_rules=self.key_rules.get() or None,
+            fuzzy_threshold=self.fuzzy_match_percent.get() / 100,
+            cache_limit_mb=self.cache_limit_mb.get(),
+            memory_budget_mb=self.memory_budget_mb.get(),
+            performance_profile=self.performance_profile.get(),
+            profiler=self.profiler_mode.get() or None
+        )
+
     def run_translation(self, max_workers, file_type):
         """Run translation process"""
         try:
-            if file_type == 'yaml':
-                self.translator = YamlTranslatorEngine(
-                    source_file=self.source_file.get(),
-                    output_file=self.output_file.get(),
-                    source_lang=self.source_lang.get(),
-                    target_lang=self.target_lang.get(),
-                    max_workers=max_workers,
-                    batch_size=self.batch_size.get(),
-                    delay_between_requests=self.delay_between_requests.get(),
-                    log_callback=self.log,
-                    progress_callback=self.update_progress
-                )
-            else:
-                self.translator = PropertiesTranslatorEngine(
-                    source_file=self.source_file.get(),
-                    output_file=self.output_file.get(),
-                    source_lang=self.source_lang.get(),
-                    target_lang=self.target_lang.get(),
-                    max_workers=max_workers,
-                    batch_size=self.batch_size.get(),
-                    delay_between_requests=self.delay_between_requests.get(),
-                    log_callback=self.log,
-                    progress_callback=self.update_progress
-                )
-
-            self.translator.translate_file()
+            if self.daemon_address.get():
+                self.run_daemon_translation(file_type)
+                return
+
+            self.translator = create_translator_engine(file_type, **self.get_engine_kwargs(max_workers))
+
+            self.translator.translate_file_with_profiler()
 
         except Exception as e:
             self.log(f"Translation error: {e}")
@@ -653,8 +923,29 @@ After installing new languages, click 'Refresh Languages' to update the list."""
             self.is_translating = False
             self.start_button.config(state=tk.NORMAL)
             self.stop_button.config(state=tk.DISABLED)
+            self.pause_button.config(state=tk.DISABLED, text="Pause")
             self.progress.config(value=0)
 
+    def run_daemon_translation(self, file_type):
+        """Send the translation job to a running daemon"""
+        self.log(f"Sending job to translation daemon at {self.daemon_address.get()}")
+        result = DaemonClient(self.daemon_address.get()).translate_file(
+            self.source_file.get(),
+            self.output_file.get(),
+            self.source_lang.get(),
+            self.target_lang.get(),
+            file_type=file_type,
+            batch_size=self.batch_size.get(),
+            delay_between_requests=self.delay_between_requests.get(),
+            skip_target_language=self.skip_target_language.get(),
+            glossary_file=self.glossary_file.get() or None,
+            key_rules=self.key_rules.get() or None,
+            fuzzy_threshold=self.fuzzy_match_percent.get() / 100,
+            performance_profile=self.performance_profile.get()
+        )
+        for message in result['log']:
+            self.log(message)
+
     def update_progress(self, current, total):
         """Update progress bar"""
         if total > 0:
@@ -662,289 +953,2827 @@ After installing new languages, click 'Refresh Languages' to update the list."""
             self.progress.config(value=progress_value)
 
 
-class BaseTranslatorEngine:
-    """Base class for translation engines"""
-
-    def __init__(self, source_file, output_file, source_lang, target_lang,
-                 max_workers=2, batch_size=5, delay_between_requests=0.3,
-                 log_callback=None, progress_callback=None):
-        self.source_file = source_file
-        self.output_file = output_file
-        self.source_lang = source_lang
-        self.target_lang = target_lang
-        self.max_workers = max_workers
-        self.batch_size = batch_size
-        self.delay_between_requests = delay_between_requests
-        self.log_callback = log_callback or print
-        self.progress_callback = progress_callback or (lambda x, y: None)
-
-        self.stop_translation = False
-        self.translation_cache = {}
-        self.translation_lock = threading.Lock()
-
-        self.setup_translation()
-        self.compile_ignore_patterns()
+class LanguageIdentifier:
+    """Lightweight character n-gram language identifier used to pre-filter segments"""
+
+    # Small built-in sample corpora, written in the register of typical plugin messages
+    SAMPLES = {
+        'en': "You have been teleported to the spawn. Welcome back to the server, please read the rules "
+              "before you start playing. You do not have permission to use this command. The player is "
+              "not online right now. Your balance has been updated and the item was added to your "
+              "inventory. Click here to open the shop menu. Are you sure you want to leave the party? "
+              "The arena will start in a few seconds, get ready and good luck. This world is protected "
+              "and you cannot break blocks here. Your home has been set successfully.",
+        'id': "Kamu telah diteleportasi ke spawn. Selamat datang kembali di server, silakan baca aturan "
+              "sebelum mulai bermain. Kamu tidak memiliki izin untuk menggunakan perintah ini. Pemain "
+              "tersebut sedang tidak online. Saldo kamu telah diperbarui dan barang sudah ditambahkan ke "
+              "inventaris. Klik di sini untuk membuka menu toko. Apakah kamu yakin ingin keluar dari "
+              "party? Arena akan dimulai dalam beberapa detik, bersiaplah dan semoga beruntung. Dunia "
+              "ini dilindungi dan kamu tidak bisa menghancurkan blok di sini. Rumah kamu berhasil diatur.",
+        'es': "Has sido teletransportado al spawn. Bienvenido de nuevo al servidor, por favor lee las "
+              "reglas antes de empezar a jugar. No tienes permiso para usar este comando. El jugador no "
+              "está conectado ahora mismo. Tu saldo ha sido actualizado y el objeto fue añadido a tu "
+              "inventario. Haz clic aquí para abrir el menú de la tienda. ¿Estás seguro de que quieres "
+              "salir del grupo? La arena comenzará en unos segundos, prepárate y buena suerte.",
+        'pt': "Você foi teletransportado para o spawn. Bem-vindo de volta ao servidor, por favor leia as "
+              "regras antes de começar a jogar. Você não tem permissão para usar este comando. O jogador "
+              "não está online agora. Seu saldo foi atualizado e o item foi adicionado ao seu inventário. "
+              "Clique aqui para abrir o menu da loja. Tem certeza de que deseja sair do grupo? A arena "
+              "vai começar em alguns segundos, prepare-se e boa sorte.",
+        'fr': "Vous avez été téléporté au spawn. Bon retour sur le serveur, veuillez lire les règles "
+              "avant de commencer à jouer. Vous n'avez pas la permission d'utiliser cette commande. Le "
+              "joueur n'est pas connecté pour le moment. Votre solde a été mis à jour et l'objet a été "
+              "ajouté à votre inventaire. Cliquez ici pour ouvrir le menu de la boutique. Êtes-vous sûr "
+              "de vouloir quitter le groupe? L'arène va commencer dans quelques secondes, bonne chance.",
+        'de': "Du wurdest zum Spawn teleportiert. Willkommen zurück auf dem Server, bitte lies die Regeln "
+              "bevor du anfängst zu spielen. Du hast keine Berechtigung, diesen Befehl zu benutzen. Der "
+              "Spieler ist gerade nicht online. Dein Kontostand wurde aktualisiert und der Gegenstand "
+              "wurde deinem Inventar hinzugefügt. Klicke hier, um das Shopmenü zu öffnen. Bist du sicher, "
+              "dass du die Gruppe verlassen willst? Die Arena startet in wenigen Sekunden, viel Glück.",
+        'nl': "Je bent naar de spawn geteleporteerd. Welkom terug op de server, lees alsjeblieft de regels "
+              "voordat je begint met spelen. Je hebt geen toestemming om dit commando te gebruiken. De "
+              "speler is nu niet online. Je saldo is bijgewerkt en het voorwerp is aan je inventaris "
+              "toegevoegd. Klik hier om het winkelmenu te openen. Weet je zeker dat je de groep wilt "
+              "verlaten? De arena begint over een paar seconden, maak je klaar en veel succes.",
+        'it': "Sei stato teletrasportato allo spawn. Bentornato sul server, per favore leggi le regole "
+              "prima di iniziare a giocare. Non hai il permesso di usare questo comando. Il giocatore non "
+              "è online in questo momento. Il tuo saldo è stato aggiornato e l'oggetto è stato aggiunto "
+              "al tuo inventario. Clicca qui per aprire il menu del negozio. Sei sicuro di voler lasciare "
+              "il gruppo? L'arena inizierà tra pochi secondi, preparati e buona fortuna.",
+    }
+
+    NGRAM_SIZE = 3
+    word_pattern = re.compile(r'[^\W\d_]+')
+    MIN_LETTERS = 12  # Shorter fragments are too ambiguous to classify
+    MIN_MARGIN = 0.35  # Required per-n-gram log-likelihood margin over the runner-up
+    MAX_CACHED_DECISIONS = 65536  # Repeated segments are classified once
+
+    _default_instance = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, samples=None):
+        self.languages = []
+        profiles = []
+        for code, sample in (samples or self.SAMPLES).items():
+            counts = {}
+            for gram in self.extract_ngrams(sample):
+                counts[gram] = counts.get(gram, 0) + 1
+            total = sum(counts.values())
+            vocabulary = len(counts) + 1
+            # Store log-probabilities with add-one smoothing so scoring is a plain sum
+            profiles.append((
+                {gram: math.log((count + 1) / (total + vocabulary)) for gram, count in counts.items()},
+                math.log(1 / (total + vocabulary))
+            ))
+            self.languages.append(code)
+
+        # One row of per-language scores per n-gram, so a text is scored with a single column sum
+        self.unseen_row = tuple(unseen for _, unseen in profiles)
+        all_grams = set().union(*(log_probs for log_probs, _ in profiles))
+        self.score_table = {
+            gram: tuple(log_probs.get(gram, unseen) for log_probs, unseen in profiles)
+            for gram in all_grams
+        }
+        self.profiles = set(self.languages)
+
+        self.decisions = OrderedDict()  # Text -> (language, margin), least recently used first
+        self.decisions_lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """Get the shared identifier built from the built-in samples"""
+        with cls._default_lock:
+            if cls._default_instance is None:
+                cls._default_instance = cls()
+            return cls._default_instance
+
+    def extract_ngrams(self, text):
+        """Extract padded character n-grams from the letters of a text"""
+        size = self.NGRAM_SIZE
+        return [
+            padded[i:i + size]
+            for padded in (f" {word} " for word in self.word_pattern.findall(text.lower()))
+            for i in range(len(padded) - size + 1)
+        ]
 
-    def setup_translation(self):
-        """Setup translation engine"""
-        installed_languages = argostranslate.translate.get_installed_languages()
-        self.from_lang = next((lang for lang in installed_languages if lang.code == self.source_lang), None)
-        self.to_lang = next((lang for lang in installed_languages if lang.code == self.target_lang), None)
+    def supports(self, lang_code):
+        """Check if a language has a built-in profile"""
+        return lang_code in self.profiles
+
+    def classify(self, text):
+        """Return (language, margin) for a text, or (None, 0.0) if it is too short"""
+        with self.decisions_lock:
+            decision = self.decisions.get(text)
+            if decision is not None:
+                self.decisions.move_to_end(text)
+                return decision
+
+        decision = self.score(text)
+        with self.decisions_lock:
+            self.decisions[text] = decision
+            if len(self.decisions) > self.MAX_CACHED_DECISIONS:
+                self.decisions.popitem(last=False)
+        return decision
+
+    def score(self, text):
+        """Classify a text with the n-gram profiles"""
+        grams = self.extract_ngrams(text)
+        # Every letter yields one n-gram, so this is also the letter count
+        if len(grams) < self.MIN_LETTERS:
+            return None, 0.0
+
+        unseen_row = self.unseen_row
+        rows = [self.score_table.get(gram, unseen_row) for gram in grams]
+        scores = sorted(zip(map(sum, zip(*rows)), self.languages), reverse=True)
+        scores = [(score / len(grams), code) for score, code in scores[:2]]
+
+        if len(scores) < 2:
+            return scores[0][1], float('inf')
+        return scores[0][1], scores[0][0] - scores[1][0]
+
+    def should_skip(self, text, source_lang, target_lang):
+        """Check if a segment is already in the target language or in neither language"""
+        if not self.supports(target_lang):
+            return False
 
-        if not self.from_lang or not self.to_lang:
-            raise Exception(f"Language pair {self.source_lang}->{self.target_lang} not available")
+        lang, margin = self.classify(text)
+        if lang is None or margin < self.MIN_MARGIN:
+            return False
 
-        self.translation_engine = self.from_lang.get_translation(self.to_lang)
+        if lang == target_lang:
+            return True
 
-    def compile_ignore_patterns(self):
-        """Compile ignore patterns with fixed Minecraft color code handling"""
-        patterns = [
-            r'%[^%]*%',  # Placeholder patterns like %player%
-            r'<[^<>]*>',  # HTML/XML tags
-            r'\{[^{}]*\}',  # JSON/bracket placeholders
-            r'\[[^\[\]]*\]',  # Square bracket placeholders
-            r'minecraft:[a-zA-Z0-9_]+',  # Minecraft namespaced IDs
-            r'\b(sound|particle|block|entity|item|effect|enchantment|potion|biome|dimension)\.[a-zA-Z0-9_.]+\b',
-            # Technical terms
-            r'[=+\-*/]',  # Math operators
-            r'\b[a-zA-Z0-9_]+\.[a-zA-Z0-9_.]+\b',  # Domain-like patterns
-            r'https?://\S+',  # URLs
-            r'^\d+$',  # Numbers only
-            r'^[^\w\s]+$',  # Special characters only
-            r'^\w$'  # Single characters
-        ]
+        # Only claim "neither language" when both sides of the pair could have been recognised
+        return self.supports(source_lang) and lang != source_lang
+
+
+class Glossary:
+    """Do-not-translate and fixed-translation terms matched with an Aho-Corasick automaton"""
+
+    CACHE_VERSION = 1
+
+    _loaded = {}
+    _loaded_lock = threading.Lock()
+
+    def __init__(self, terms, ignore_case=True):
+        self.ignore_case = ignore_case
+        self.terms = []  # Matched term text, kept for diagnostics
+        self.replacements = []  # Fixed translation, or None to keep the source text
+
+        # Automaton stored as flat per-state lists so it pickles compactly
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [-1]  # Term index ending at this state, or -1
+        self.dict_link = [0]  # Nearest state on the fail chain with an output
+
+        for term, replacement in terms:
+            self.add_term(term, replacement)
+        self.build_links()
+
+    def add_term(self, term, replacement=None):
+        """Insert a term into the trie"""
+        key = term.lower() if self.ignore_case else term
+        state = 0
+        for char in key:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append(-1)
+                self.dict_link.append(0)
+            state = next_state
+
+        if self.output[state] == -1:
+            self.output[state] = len(self.terms)
+            self.terms.append(term)
+            self.replacements.append(replacement)
+        else:
+            # Later entries override earlier ones for the same term
+            self.replacements[self.output[state]] = replacement
+
+    def build_links(self):
+        """Compute failure and dictionary links breadth-first"""
+        queue_states = list(self.goto[0].values())
+        for state in queue_states:
+            self.fail[state] = 0
+            self.dict_link[state] = 0
+
+        index = 0
+        while index < len(queue_states):
+            state = queue_states[index]
+            index += 1
+            for char, next_state in self.goto[state].items():
+                queue_states.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                fail_state = self.fail[next_state]
+                self.dict_link[next_state] = fail_state if self.output[fail_state] != -1 else self.dict_link[fail_state]
+
+    @staticmethod
+    def parse_term_file(path):
+        """Parse a term file: one term per line, optionally 'term = fixed translation'"""
+        terms = []
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                if '=' in line:
+                    term, replacement = line.split('=', 1)
+                    term, replacement = term.strip(), replacement.strip()
+                else:
+                    term, replacement = line, None
+                if term:
+                    terms.append((term, replacement))
+        return terms
+
+    @classmethod
+    def load(cls, path, log_callback=None, ignore_case=True):
+        """Load a glossary, reusing the compiled automaton cached on disk for this file content"""
+        log_callback = log_callback or print
+
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        cache_key = f"{digest}-{int(ignore_case)}-v{cls.CACHE_VERSION}"
+
+        with cls._loaded_lock:
+            if cache_key in cls._loaded:
+                return cls._loaded[cache_key]
+
+            cache_file = os.path.join(get_app_data_dir(), f"glossary-{cache_key}.pickle")
+            glossary = None
+            if os.path.exists(cache_file):
+                try:
+                    # Only plain containers are pickled so the cache does not depend on the module name
+                    glossary = cls.__new__(cls)
+                    with open(cache_file, 'rb') as f:
+                        glossary.__dict__.update(pickle.load(f))
+                    log_callback(f"Loaded compiled glossary from cache ({len(glossary.terms)} terms)")
+                except Exception as e:
+                    log_callback(f"Ignoring unreadable glossary cache: {e}")
+                    glossary = None
 
-        self.ignore_patterns = re.compile('|'.join(f'({pattern})' for pattern in patterns))
+            if glossary is None:
+                glossary = cls(cls.parse_term_file(path), ignore_case=ignore_case)
+                log_callback(f"Compiled glossary with {len(glossary.terms)} terms")
+                try:
+                    with open(cache_file, 'wb') as f:
+                        pickle.dump(glossary.__dict__, f, protocol=pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    log_callback(f"Could not cache compiled glossary: {e}")
 
-        # Enhanced split pattern that properly handles Minecraft color codes
-        self.split_pattern = re.compile(
-            r'('
-            r'&[0-9a-fk-or]|'  # Minecraft color codes (& followed by valid color/formatting code)
-            r'§[0-9a-fk-or]|'  # Minecraft section sign color codes
-            r'%[^%]*%|'  # Placeholder patterns
-            r'<[^<>]*>|'  # HTML/XML tags
-            r'\{[^{}]*\}|'  # JSON/bracket placeholders
-            r'\[[^\[\]]*\]|'  # Square bracket placeholders
-            r'minecraft:[a-zA-Z0-9_]+|'  # Minecraft namespaced IDs
-            r'https?://\S+|'  # URLs
-            r'/\w+|'  # Commands
-            r'\b[a-zA-Z0-9_.]+\.[a-zA-Z0-9_.]+\b'  # Domain-like patterns
-            r')'
-        )
+            cls._loaded[cache_key] = glossary
+            return glossary
 
-        # Pattern to identify Minecraft color codes specifically
-        self.minecraft_color_pattern = re.compile(r'[&§][0-9a-fk-or]')
+    @staticmethod
+    def is_word_char(char):
+        """Check if a character continues a word"""
+        return char.isalnum() or char == '_'
 
-    def should_ignore(self, text):
-        """Check if text should be ignored"""
-        if not text or not text.strip() or len(text.strip()) <= 2:
+    def starts_word(self, text, start):
+        """Check if a match may start here: at a word boundary or right after a color code like &a"""
+        if start == 0 or not self.is_word_char(text[start - 1]):
             return True
+        return start >= 2 and text[start - 2] in '&§' and text[start - 1] in '0123456789abcdefklmnor'
+
+    def find_matches(self, text):
+        """Find leftmost-longest whole-word term matches as (start, end, term_index)"""
+        haystack = text
+        offsets = None
+        if self.ignore_case:
+            haystack = text.lower()
+            # Lower-casing can lengthen some characters (e.g. 'İ'), so map haystack offsets back to the text
+            if len(haystack) != len(text):
+                haystack = ''.join(char.lower() for char in text)
+                offsets = [index for index, char in enumerate(text) for _ in char.lower()]
+                offsets.append(len(text))
+
+        candidates = []
+        state = 0
+        for position, char in enumerate(haystack):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+
+            match_state = state if self.output[state] != -1 else self.dict_link[state]
+            while match_state:
+                term_index = self.output[match_state]
+                term = self.terms[term_index]
+                end = position + 1
+                start = end - len(term.lower() if self.ignore_case else term)
+                if offsets is not None:
+                    # A match starting or ending inside a lengthened character is not a whole word
+                    if ((start and offsets[start - 1] == offsets[start]) or
+                            offsets[end - 1] == offsets[end]):
+                        match_state = self.dict_link[match_state]
+                        continue
+                    start, end = offsets[start], offsets[end]
+                if self.starts_word(text, start) and (end == len(text) or not self.is_word_char(text[end])):
+                    candidates.append((start, end, term_index))
+                match_state = self.dict_link[match_state]
 
-        # Check if it's a Minecraft color code
-        if self.minecraft_color_pattern.fullmatch(text.strip()):
-            return True
+        if not candidates:
+            return []
 
-        return bool(self.ignore_patterns.fullmatch(text.strip()))
+        # Keep non-overlapping matches, preferring the leftmost and then the longest one
+        candidates.sort(key=lambda match: (match[0], -match[1]))
+        matches = []
+        last_end = 0
+        for start, end, term_index in candidates:
+            if start >= last_end:
+                matches.append((start, end, term_index))
+                last_end = end
+        return matches
+
+    def split(self, text):
+        """Split text into (chunk, replacement) pairs; replacement is None for free text"""
+        matches = self.find_matches(text)
+        if not matches:
+            return [(text, None)]
+
+        chunks = []
+        position = 0
+        for start, end, term_index in matches:
+            if start > position:
+                chunks.append((text[position:start], None))
+            replacement = self.replacements[term_index]
+            chunks.append((text[start:end], replacement if replacement is not None else text[start:end]))
+            position = end
+        if position < len(text):
+            chunks.append((text[position:], None))
+        return chunks
+
+
+class ThroughputLog:
+    """Model throughput measured on this machine, persisted per language pair"""
+
+    FILENAME = 'throughput.json'
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def path(cls):
+        return os.path.join(get_app_data_dir(), cls.FILENAME)
+
+    @classmethod
+    def load(cls):
+        """Load all recorded measurements"""
+        try:
+            with open(cls.path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    @classmethod
+    def get(cls, source_lang, target_lang):
+        """Get the recorded measurement for a language pair, or None"""
+        return cls.load().get(f"{source_lang}>{target_lang}")
+
+    @classmethod
+    def record(cls, source_lang, target_lang, chars, segments, seconds):
+        """Record the model throughput of a finished run"""
+        if seconds <= 0 or chars <= 0:
+            return
+        with cls._lock:
+            data = cls.load()
+            data[f"{source_lang}>{target_lang}"] = {
+                'chars_per_second': chars / seconds,
+                'segments_per_second': segments / seconds,
+                'measured_at': time.strftime("%Y-%m-%d %H:%M:%S")
+            }
+            try:
+                with open(cls.path(), 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+            except Exception:
+                pass
 
-    def translate_text(self, text):
-        """Translate text with caching"""
-        if not text or self.should_ignore(text):
-            return text
 
-        text_key = text.strip()
-        if text_key in self.translation_cache:
-            return self.translation_cache[text_key]
+def get_hardware_info():
+    """Get the physical and logical core counts and the memory of this machine"""
+    logical = psutil.cpu_count() or 1
+    memory = psutil.virtual_memory()
+    return {
+        # Hyper-threads add little to model inference, so physical cores are what counts
+        'physical_cores': psutil.cpu_count(logical=False) or logical,
+        'logical_cores': logical,
+        'total_memory': memory.total,
+        'available_memory': memory.available,
+    }
+
+
+class WorkerTuning:
+    """Worker count calibrated per machine and language pair, persisted in the app data dir"""
+
+    FILENAME = 'autotune.json'
+    AUTO = 'auto'
+    DEFAULT_WORKERS = 2
+    # The batch size is only a dispatch grain (segments handed to a worker at once); the model still
+    # gets one segment per call, so it is not worth calibrating and 'auto' always means this value
+    DEFAULT_BATCH_SIZE = 5
+    # Memory kept free for every concurrent model call (activations and beam buffers)
+    WORKER_MEMORY = 300 * 1024 * 1024
+    # A more expensive setting has to be this much faster to win
+    MIN_GAIN = 0.05
+    # Short, distinct messages so no setting is helped by the translation memory
+    SAMPLE_TEXTS = (
+        "Welcome to the server!",
+        "You do not have permission to use this command.",
+        "Your inventory is full.",
+        "The arena is starting soon, get ready.",
+        "This player is currently offline.",
+        "You have been teleported to spawn.",
+        "Click here to open the shop menu.",
+        "Your home has been set successfully.",
+        "Please wait before using this again.",
+        "The game has ended in a draw.",
+        "You cannot build in this area.",
+        "Your party invitation has expired.",
+        "Thank you for voting for our server!",
+        "This kit can only be claimed once per day.",
+        "The auction house is currently closed.",
+        "You joined the red team.",
+    )
+
+    _lock = threading.Lock()
+
+    @classmethod
+    def path(cls):
+        return os.path.join(get_app_data_dir(), cls.FILENAME)
+
+    @classmethod
+    def load(cls):
+        """Load all calibrations"""
+        try:
+            with open(cls.path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    @staticmethod
+    def machine_key(hardware):
+        """Identify the hardware a calibration was made on, so a copied or upgraded profile recalibrates"""
+        return (f"{platform.node()}/{platform.machine()}/{hardware['physical_cores']}c"
+                f"{hardware['logical_cores']}t/{round(hardware['total_memory'] / 1024 ** 3)}GB")
+
+    @staticmethod
+    def pair_key(source_lang, target_lang, profile):
+        return f"{source_lang}>{target_lang}:{profile.name}"
+
+    @classmethod
+    def get(cls, source_lang, target_lang, profile, hardware=None):
+        """Get the calibration of a language pair on this machine, or None"""
+        machine = cls.machine_key(hardware or get_hardware_info())
+        return cls.load().get(machine, {}).get(cls.pair_key(source_lang, target_lang, profile))
+
+    @classmethod
+    def record(cls, source_lang, target_lang, profile, hardware, result):
+        """Persist the calibration of a language pair on this machine"""
+        with cls._lock:
+            data = cls.load()
+            data.setdefault(cls.machine_key(hardware), {})[cls.pair_key(source_lang, target_lang, profile)] = result
+            try:
+                with open(cls.path(), 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+            except Exception:
+                pass
 
+    @classmethod
+    def worker_limit(cls, hardware):
+        """Most workers worth trying: one per physical core, as far as free memory allows"""
+        by_memory = hardware['available_memory'] // cls.WORKER_MEMORY
+        return max(1, min(hardware['physical_cores'], by_memory))
+
+    @classmethod
+    def candidates(cls, hardware):
+        """Worker counts to measure, cheapest first; the sample has to give every worker a segment"""
+        limit = min(cls.worker_limit(hardware), len(cls.SAMPLE_TEXTS))
+        return sorted({count for count in (1, 2, limit // 2, limit) if 1 <= count <= limit})
+
+    @classmethod
+    def calibrate(cls, engine, hardware):
+        """Measure pipeline throughput of the engine's model at each candidate worker count"""
+        engine.log_callback(f"Calibrating workers for {engine.source_lang}->{engine.target_lang} on "
+                            f"{hardware['physical_cores']} physical / {hardware['logical_cores']} logical cores, "
+                            f"{hardware['available_memory'] / 1024 ** 3:.1f} GB free...")
+        chars = sum(map(len, cls.SAMPLE_TEXTS))
+        saved = (engine.max_workers, engine.batch_size, engine.translation_memory, engine.language_identifier,
+                 engine.model_calls, engine.model_chars)
+        measurements = []
         try:
-            with self.translation_lock:
-                result = self.translation_engine.translate(text_key)
-                if result:
-                    self.translation_cache[text_key] = result
-                    return result
-        except Exception as e:
-            self.log_callback(f"Translation error for '{text}': {e}")
+            engine.language_identifier = None
+            # One segment per hand-off, so every worker is kept busy by the short sample
+            engine.batch_size = 1
+            for workers in cls.candidates(hardware):
+                engine.max_workers = workers
+                # A private memory per setting, so every setting pays for the same model calls
+                engine.translation_memory = TranslationMemory()
+                started = time.perf_counter()
+                engine.translate_texts(cls.SAMPLE_TEXTS)
+                elapsed = time.perf_counter() - started
+                if engine.stop_translation:
+                    return None
+                measurements.append((workers, chars / max(elapsed, 1e-9)))
+                engine.log_callback(f"  {workers} workers: {measurements[-1][1]:.0f} chars/s")
+        finally:
+            (engine.max_workers, engine.batch_size, engine.translation_memory, engine.language_identifier,
+             engine.model_calls, engine.model_chars) = saved
 
-        return text
+        best = measurements[0]
+        for measurement in measurements[1:]:
+            if measurement[1] > best[1] * (1 + cls.MIN_GAIN):
+                best = measurement
+        return {
+            'workers': best[0],
+            'chars_per_second': best[1],
+            'measured_at': time.strftime("%Y-%m-%d %H:%M:%S")
+        }
 
-    def translate_complex_text(self, text):
-        """Translate complex text by splitting it properly for Minecraft formatting"""
-        if self.should_ignore(text):
-            return text
+    @classmethod
+    def tune(cls, engine):
+        """Get the calibrated workers and the default batch size for an engine, calibrating on first use"""
+        hardware = get_hardware_info()
+        result = cls.get(engine.source_lang, engine.target_lang, engine.performance_profile, hardware)
+        if result is None and engine.translation_engine is not None:
+            result = cls.calibrate(engine, hardware)
+            if result is not None:
+                cls.record(engine.source_lang, engine.target_lang, engine.performance_profile, hardware, result)
+        if result is None:
+            return cls.DEFAULT_WORKERS, cls.DEFAULT_BATCH_SIZE
+        return result['workers'], cls.DEFAULT_BATCH_SIZE
+
+
+class TranslationCache:
+    """Process-wide translation cache bounded by memory size with LRU eviction"""
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    ENCODE_THRESHOLD = 64  # Longer values are stored as UTF-8 bytes
+    ENTRY_OVERHEAD = 100  # Approximate bookkeeping cost of one OrderedDict entry
+
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+        self.fuzzy_indexes = {}  # Namespace -> FuzzyIndex shared by every memory using this cache
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def shared(cls):
+        """Get the cache instance shared by all engines in this process"""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def entry_size(self, key, value):
+        """Estimate the memory used by one entry"""
+        return sys.getsizeof(key) + sys.getsizeof(value) + self.ENTRY_OVERHEAD
+
+    def get(self, key, default=None):
+        """Get a value and mark it as recently used"""
+        with self.lock:
+            value = self.entries.get(key)
+            if value is None:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def peek(self, key, default=None):
+        """Get a value without touching statistics or LRU order"""
+        with self.lock:
+            value = self.entries.get(key)
+        if value is None:
+            return default
+        return value.decode('utf-8') if isinstance(value, bytes) else value
+
+    def fuzzy_index(self, namespace):
+        """Get the fuzzy index shared by all memories of one namespace"""
+        with self.lock:
+            index = self.fuzzy_indexes.get(namespace)
+            if index is None:
+                index = self.fuzzy_indexes[namespace] = FuzzyIndex()
+            return index
+
+    def __contains__(self, key):
+        with self.lock:
+            return key in self.entries
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        key = sys.intern(key)
+        if len(value) >= self.ENCODE_THRESHOLD:
+            value = value.encode('utf-8')
+        size = self.entry_size(key, value)
+
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= self.entry_size(key, previous)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = value
+            self.current_bytes += size
+            self.evict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits its limit (lock held)"""
+        while self.current_bytes > self.max_bytes and self.entries:
+            key, value = self.entries.popitem(last=False)
+            self.current_bytes -= self.entry_size(key, value)
+            self.evictions += 1
+
+    def resize(self, max_bytes):
+        """Change the size limit, evicting entries if needed"""
+        with self.lock:
+            self.max_bytes = max_bytes
+            self.evict()
+
+    def clear(self):
+        """Remove all entries and reset statistics"""
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+            indexes = list(self.fuzzy_indexes.values())
+        for index in indexes:
+            index.clear()
+
+    def describe(self):
+        """Get a one-line summary of size and hit statistics"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups * 100) if lookups else 0.0
+        return (f"{len(self.entries)} entries, {self.current_bytes / 1024 / 1024:.1f}/"
+                f"{self.max_bytes / 1024 / 1024:.0f} MB, {self.hits} hits, {self.misses} misses "
+                f"({hit_rate:.1f}% hit rate), {self.evictions} evictions")
+
+
+class FuzzyIndex:
+    """Character n-gram index of template keys bounded by memory size with LRU eviction"""
+
+    NGRAM_SIZE = 3
+    DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+    GRAM_OVERHEAD = 40  # Approximate cost of one posting in an n-gram set
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.keys = OrderedDict()  # Template -> its n-grams
+        self.postings = {}  # N-gram -> templates containing it
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+
+    def extract_ngrams(self, text):
+        """Get the set of character n-grams of a template key"""
+        padded = f" {text.lower()} "
+        return frozenset(padded[i:i + self.NGRAM_SIZE] for i in range(len(padded) - self.NGRAM_SIZE + 1))
+
+    def entry_size(self, template, grams):
+        """Estimate the memory used by one indexed template"""
+        return sys.getsizeof(template) + len(grams) * self.GRAM_OVERHEAD
+
+    def add(self, template):
+        """Index a template key, evicting the least recently added ones over the limit"""
+        with self.lock:
+            if template in self.keys:
+                self.keys.move_to_end(template)
+                return
+            grams = self.extract_ngrams(template)
+            self.keys[template] = grams
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(template)
+            self.current_bytes += self.entry_size(template, grams)
+            while self.current_bytes > self.max_bytes and self.keys:
+                self.remove_locked(next(iter(self.keys)))
+
+    def remove(self, template):
+        """Drop a template key, e.g. after the cache evicted its translation"""
+        with self.lock:
+            self.remove_locked(template)
+
+    def remove_locked(self, template):
+        """Drop a template key (lock held)"""
+        grams = self.keys.pop(template, None)
+        if grams is None:
+            return
+        for gram in grams:
+            templates = self.postings.get(gram)
+            if templates is not None:
+                templates.discard(template)
+                if not templates:
+                    del self.postings[gram]
+        self.current_bytes -= self.entry_size(template, grams)
+
+    def candidates(self, template, limit, min_overlap):
+        """Get up to limit (candidate, n-gram overlap) pairs ranked by shared n-grams"""
+        grams = self.extract_ngrams(template)
+        with self.lock:
+            shared_counts = {}
+            for gram in grams:
+                for key in self.postings.get(gram, ()):
+                    shared_counts[key] = shared_counts.get(key, 0) + 1
+            ranked = sorted(shared_counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+            result = []
+            for key, shared in ranked:
+                overlap = 2 * shared / (len(grams) + len(self.keys[key]))
+                if overlap < min_overlap:
+                    break
+                result.append((key, overlap))
+        return result
 
-        # Split the text while preserving Minecraft color codes and other special patterns
-        parts = self.split_pattern.split(text)
-        result_parts = []
+    def clear(self):
+        """Remove all indexed keys"""
+        with self.lock:
+            self.keys.clear()
+            self.postings.clear()
+            self.current_bytes = 0
 
-        i = 0
-        while i < len(parts):
-            part = parts[i]
+    def __len__(self):
+        return len(self.keys)
 
-            if not part:  # Skip empty parts
-                i += 1
-                continue
 
-            # Check if this part is a Minecraft color code
-            if self.minecraft_color_pattern.fullmatch(part):
-                result_parts.append(part)
-
-                # Check if the next part should be attached (no space between color code and text)
-                if (i + 1 < len(parts) and
-                        parts[i + 1] and
-                        not parts[i + 1].startswith(' ') and
-                        not self.should_ignore(parts[i + 1])):
-
-                    # Add the color code and translate the next part
-                    next_part = parts[i + 1]
-                    if next_part and not self.should_ignore(next_part):
-                        # Translate the text part that follows the color code
-                        translated_part = self.translate_text(next_part)
-                        result_parts.append(translated_part)
-                        i += 2  # Skip both current and next part
-                        continue
+class TranslationMemory:
+    """Translation lookup with slot normalization and optional n-gram fuzzy matching"""
 
-                i += 1
-                continue
+    # Numbers, color codes and placeholders are abstracted into numbered slots
+    SLOT_PATTERN = re.compile(r'[&§][0-9a-fk-or]|%[^%\s]*%|\{[^{}]*\}|\d+(?:[.,]\d+)*')
+    SLOT_MARKER = '\ue000{}\ue001'  # Private-use characters never appear in real messages
+    MAX_FUZZY_CANDIDATES = 20
 
-            # Check if this part should be ignored (special patterns, URLs, etc.)
-            if self.should_ignore(part):
-                result_parts.append(part)
-            else:
-                # This is regular text that should be translated
-                translated_part = self.translate_text(part)
-                result_parts.append(translated_part)
+    def __init__(self, store=None, fuzzy_threshold=0.0, namespace=""):
+        self.store = store if store is not None else {}
+        self.fuzzy_threshold = fuzzy_threshold
+        self.namespace = namespace  # Keeps language pairs apart in a shared store
+        self.lock = threading.Lock()
 
-            i += 1
+        # A shared cache also shares the fuzzy index, so engines do not each build a copy
+        if hasattr(self.store, 'fuzzy_index'):
+            self.fuzzy_index = self.store.fuzzy_index(namespace)
+        else:
+            self.fuzzy_index = FuzzyIndex()
+
+        self.exact_hits = 0
+        self.template_hits = 0
+        self.fuzzy_hits = 0
+
+    def normalize(self, text):
+        """Return (template, slot_values) with slot values replaced by markers"""
+        slots = []
+
+        def to_marker(match):
+            slots.append(match.group(0))
+            return self.SLOT_MARKER.format(len(slots) - 1)
+
+        return self.SLOT_PATTERN.sub(to_marker, text), slots
+
+    def fill_slots(self, template, slots):
+        """Put slot values back into a translated template"""
+        for index, value in enumerate(slots):
+            template = template.replace(self.SLOT_MARKER.format(index), value)
+        return template
+
+    def abstract_translation(self, translation, slots):
+        """Turn a concrete translation into a template, or None if slots cannot be located"""
+        if len(set(slots)) != len(slots):
+            return None
+
+        spans = []
+        for index, value in enumerate(slots):
+            if value[0].isdigit():
+                # Numbers must match whole, so '1' is not found inside '10'
+                found = list(re.finditer(rf'(?<![\d.,]){re.escape(value)}(?![\d]|[.,]\d)', translation))
+            else:
+                found = list(re.finditer(re.escape(value), translation))
+            if len(found) != 1:
+                return None
+            spans.append((found[0].start(), found[0].end(), index))
 
-        # Join all parts and clean up any double spaces that might have been introduced
-        result = ''.join(result_parts)
+        spans.sort()
+        for (_, end, _), (start, _, _) in zip(spans, spans[1:]):
+            if start < end:
+                return None
 
-        # Clean up spacing issues around color codes
-        # Remove spaces between color codes and following text
-        result = re.sub(r'([&§][0-9a-fk-or])\s+', r'\1', result)
+        parts = []
+        position = 0
+        for start, end, index in spans:
+            parts.append(translation[position:start])
+            parts.append(self.SLOT_MARKER.format(index))
+            position = end
+        parts.append(translation[position:])
+        return ''.join(parts)
+
+    def peek(self, key):
+        """Get a stored value without counting a cache hit or miss"""
+        if hasattr(self.store, 'peek'):
+            return self.store.peek(key)
+        return self.store.get(key)
+
+    def fuzzy_lookup(self, template, slots):
+        """Find the most similar stored template above the configured threshold"""
+        # Rank by n-gram overlap, then verify the best few with an exact similarity ratio
+        candidates = self.fuzzy_index.candidates(template, self.MAX_FUZZY_CANDIDATES,
+                                                 self.fuzzy_threshold * 0.8)
+        best_ratio, best_translation = 0.0, None
+        for candidate, _ in candidates:
+            candidate_slots = candidate.count('\ue000')
+            if candidate_slots != len(slots):
+                continue
+            translation = self.peek(self.namespace + candidate)
+            if translation is None:
+                self.fuzzy_index.remove(candidate)  # Evicted from the cache
+                continue
+            ratio = difflib.SequenceMatcher(None, template, candidate).ratio()
+            if ratio >= self.fuzzy_threshold and ratio > best_ratio:
+                best_ratio, best_translation = ratio, translation
 
-        return result
+        return best_translation
 
+    def contains(self, text):
+        """Check for an exact or template entry without touching statistics or LRU order"""
+        if self.namespace + text in self.store:
+            return True
+        template, slots = self.normalize(text)
+        return bool(slots) and self.namespace + template in self.store
+
+    def lookup(self, text):
+        """Get a stored translation for text, or None"""
+        with self.lock:
+            template, slots = self.normalize(text)
+            translation = self.peek(self.namespace + text)
+            if translation is not None:
+                self.exact_hits += 1
+                return self.store.get(self.namespace + text, translation)  # Counts the hit
+
+            if slots:
+                translation = self.peek(self.namespace + template)
+                if translation is not None:
+                    self.template_hits += 1
+                    return self.fill_slots(self.store.get(self.namespace + template, translation), slots)
+
+            if self.fuzzy_threshold > 0:
+                translation = self.fuzzy_lookup(template, slots)
+                if translation is not None:
+                    self.fuzzy_hits += 1
+                    return self.fill_slots(translation, slots)
+
+            # Count a single miss for the whole lookup, not one per probe
+            self.store.get(self.namespace + text)
+
+        return None
+
+    def remember(self, text, translation):
+        """Store a translation under its template when possible, else under the exact text"""
+        with self.lock:
+            template, slots = self.normalize(text)
+            key, value = text, translation
+            if slots:
+                template_translation = self.abstract_translation(translation, slots)
+                if template_translation is not None:
+                    key, value = template, template_translation
+
+            self.store[self.namespace + key] = value
+            if self.fuzzy_threshold > 0:
+                self.fuzzy_index.add(key)
+
+
+class ProfiledTranslator:
+    """Wraps a CTranslate2 translator to enforce the beam size and decoding length of a profile"""
+
+    def __init__(self, translator, beam_size=None, max_decoding_length=None):
+        self.translator = translator
+        self.beam_size = beam_size
+        self.max_decoding_length = max_decoding_length
+
+    def translate_batch(self, *args, **kwargs):
+        if self.beam_size:
+            kwargs['beam_size'] = self.beam_size
+            kwargs['num_hypotheses'] = min(kwargs.get('num_hypotheses', 1), self.beam_size)
+        if self.max_decoding_length:
+            kwargs['max_decoding_length'] = self.max_decoding_length
+        return self.translator.translate_batch(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.translator, name)
+
+
+class PerformanceProfile:
+    """CTranslate2 runtime options applied when a language pair is loaded"""
+
+    # None keeps the Argos Translate default for that option
+    PRESETS = {
+        'default': dict(inter_threads=None, intra_threads=None, compute_type=None,
+                        beam_size=None, max_decoding_length=None),
+        'fast_draft': dict(inter_threads=1, intra_threads=0, compute_type='int8',
+                           beam_size=1, max_decoding_length=128),
+        'balanced': dict(inter_threads=1, intra_threads=0, compute_type='int8',
+                         beam_size=2, max_decoding_length=256),
+        'quality': dict(inter_threads=1, intra_threads=0, compute_type='float32',
+                        beam_size=5, max_decoding_length=512),
+    }
+
+    def __init__(self, name='default', inter_threads=None, intra_threads=None, compute_type=None,
+                 beam_size=None, max_decoding_length=None):
+        self.name = name
+        self.inter_threads = inter_threads
+        self.intra_threads = intra_threads
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.max_decoding_length = max_decoding_length
+
+    @classmethod
+    def get(cls, name, **overrides):
+        """Create a profile from a preset name, with optional per-option overrides"""
+        if name not in cls.PRESETS:
+            raise Exception(f"Unknown performance profile '{name}' (choose from {', '.join(cls.PRESETS)})")
+        options = dict(cls.PRESETS[name])
+        options.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(name, **options)
+
+    def cache_key(self):
+        """Get a hashable key identifying these runtime options"""
+        return (self.name, self.inter_threads, self.intra_threads, self.compute_type,
+                self.beam_size, self.max_decoding_length)
+
+    def is_default(self):
+        """Check if the profile leaves every Argos default untouched"""
+        return all(value is None for value in (self.inter_threads, self.intra_threads, self.compute_type,
+                                               self.beam_size, self.max_decoding_length))
+
+    def describe(self):
+        """Get a one-line summary of the runtime options"""
+        def show(value):
+            return "argos default" if value is None else value
+        return (f"{self.name}: compute_type={show(self.compute_type)}, inter_threads={show(self.inter_threads)}, "
+                f"intra_threads={show(self.intra_threads)}, beam_size={show(self.beam_size)}, "
+                f"max_decoding_length={show(self.max_decoding_length)}")
+
+    def iter_package_translations(self, translation):
+        """Find the model-backed translations inside an Argos translation (pivots included)"""
+        if hasattr(translation, 'pkg') and hasattr(translation, 'translator'):
+            yield translation
+            return
+        for attribute in ('underlying', 't1', 't2'):
+            inner = getattr(translation, attribute, None)
+            if inner is not None:
+                yield from self.iter_package_translations(inner)
+
+    def apply(self, translation, log_callback=None):
+        """Load the CTranslate2 models of a translation with this profile's options"""
+        log_callback = log_callback or print
+        if self.is_default():
+            return
 
-class PropertiesTranslatorEngine(BaseTranslatorEngine):
-    """Translator engine for Properties files"""
+        package_translations = list(self.iter_package_translations(translation))
+        if not package_translations:
+            log_callback("Performance profile could not be applied to this Argos Translate version; "
+                         "using its defaults")
+            return
 
-    def process_batch(self, lines_batch):
-        """Process a batch of lines"""
-        if self.stop_translation:
-            return []
+        device = getattr(argostranslate.settings, 'device', 'cpu')
+        for package_translation in package_translations:
+            model_path = os.path.join(str(package_translation.pkg.package_path), 'model')
+            translator = ctranslate2.Translator(
+                model_path,
+                device=device,
+                inter_threads=self.inter_threads if self.inter_threads is not None else
+                getattr(argostranslate.settings, 'inter_threads', 1),
+                intra_threads=self.intra_threads if self.intra_threads is not None else
+                getattr(argostranslate.settings, 'intra_threads', 0),
+                compute_type=self.compute_type or 'default'
+            )
+            package_translation.translator = ProfiledTranslator(translator, self.beam_size,
+                                                                self.max_decoding_length)
+
+        log_callback(f"Performance profile {self.describe()}")
+
+
+class ModelRegistry:
+    """Loaded Argos translations kept warm and shared by every engine in the process"""
+
+    SELF_TEST_TEXT = "Hello, world!"
+    # Assumed footprint of a pair that has not been loaded in this process yet
+    DEFAULT_FOOTPRINT = 500 * 1024 * 1024
+
+    _shared_instance = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, memory_budget=None):
+        # Least recently used first
+        self.translations = OrderedDict()
+        # Runs currently using each loaded pair; a pair without runs is idle and may be unloaded
+        self.active = {}
+        # Pairs being loaded, with the event other requests for the same pair wait on
+        self.loading = {}
+        # Memory set aside for the loads in progress
+        self.reserved = {}
+        # Resident memory measured when each pair loaded, kept after unloading for the next estimate
+        self.footprints = {}
+        self.memory_budget = memory_budget
+        self.lock = threading.Lock()
+        # Loads are measured as the change in resident memory, so two loads must not overlap
+        self.load_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Get the registry shared by all engines in this process"""
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls()
+            return cls._shared_instance
+
+    def set_memory_budget(self, budget_mb):
+        """Limit the memory of this process (models and workers) to budget_mb; 0 or None removes the limit"""
+        with self.lock:
+            self.memory_budget = int(budget_mb * 1024 * 1024) if budget_mb else None
+
+    @staticmethod
+    def process_memory():
+        return psutil.Process().memory_info().rss
+
+    @staticmethod
+    def model_key(source_lang, target_lang, profile):
+        return source_lang, target_lang, profile.cache_key()
+
+    def get_translation(self, source_lang, target_lang, profile, log_callback=None, acquire=False):
+        """Get the translation for a language pair and profile, loading it on first use;
+        with acquire, the pair also counts as in use until release()"""
+        log_callback = log_callback or print
+        key = self.model_key(source_lang, target_lang, profile)
+
+        while True:
+            with self.lock:
+                translation = self.translations.get(key)
+                if translation is not None:
+                    self.translations.move_to_end(key)
+                    if acquire:
+                        self.active[key] += 1
+                    return translation
+                loading = self.loading.get(key)
+                if loading is None:
+                    needed = self.footprints.get(key, self.DEFAULT_FOOTPRINT)
+                    if not self.make_room(needed, log_callback):
+                        raise Exception(f"Loading {source_lang}->{target_lang} needs about {needed / 1024 ** 2:.0f} MB, "
+                                        f"but {self.process_memory() / 1024 ** 2:.0f} MB of the "
+                                        f"{self.memory_budget / 1024 ** 2:.0f} MB memory budget is already in use")
+                    loading = self.loading[key] = threading.Event()
+                    self.reserved[key] = needed
+                    break
+            # Another request is loading this pair; requests for other pairs are not held up meanwhile
+            loading.wait()
 
-        results = []
-        for line_index, line in lines_batch:
-            if self.stop_translation:
-                break
+        # The slow load runs outside the registry lock
+        try:
+            translation = self.load(key, profile, log_callback)
+            with self.lock:
+                self.translations[key] = translation
+                self.active[key] = 1 if acquire else 0
+        finally:
+            with self.lock:
+                del self.loading[key]
+                del self.reserved[key]
+            # Waiters retry: they find the pair loaded, or start their own load after a failure
+            loading.set()
+        return translation
+
+    def release(self, key):
+        """End a use taken with get_translation(acquire=True)"""
+        with self.lock:
+            if self.active.get(key):
+                self.active[key] -= 1
+
+    def load(self, key, profile, log_callback):
+        """Load a pair, measuring its footprint"""
+        source_lang, target_lang = key[0], key[1]
+        # Only loads wait for each other here; warm pairs keep being served through the registry lock
+        with self.load_lock:
+            started = time.perf_counter()
+            memory_before = self.process_memory()
+            installed_languages = argostranslate.translate.get_installed_languages()
+            from_lang = next((lang for lang in installed_languages if lang.code == source_lang), None)
+            to_lang = next((lang for lang in installed_languages if lang.code == target_lang), None)
+
+            if not from_lang or not to_lang:
+                raise Exception(f"Language pair {source_lang}->{target_lang} not available")
+
+            translation = from_lang.get_translation(to_lang)
+            if translation is None:
+                raise Exception(f"Language pair {source_lang}->{target_lang} not available")
+            profile.apply(translation, log_callback)
+            # The self-test makes Argos load the model, so the footprint includes it
+            self.self_test(translation, source_lang, target_lang)
+            footprint = max(0, self.process_memory() - memory_before)
+        self.footprints[key] = footprint
+        log_callback(f"Model {source_lang}->{target_lang} loaded and warmed up in "
+                     f"{time.perf_counter() - started:.2f}s ({footprint / 1024 ** 2:.0f} MB)")
+
+        if self.memory_budget and self.process_memory() > self.memory_budget:
+            del translation
+            gc.collect()
+            raise Exception(f"Model {source_lang}->{target_lang} takes {footprint / 1024 ** 2:.0f} MB and does not fit "
+                            f"in the {self.memory_budget / 1024 ** 2:.0f} MB memory budget")
+
+        return translation
+
+    def make_room(self, needed, log_callback):
+        """Unload idle pairs, least recently used first, until needed more bytes fit in the budget"""
+        if not self.memory_budget:
+            return True
+        while self.process_memory() + sum(self.reserved.values()) + needed > self.memory_budget:
+            idle_key = next((key for key in self.translations if not self.active[key]), None)
+            if idle_key is None:
+                return False
+            self.unload(idle_key, log_callback)
+        return True
 
-            line_stripped = line.strip()
-            if not line_stripped or line_stripped.startswith('#'):
-                results.append((line_index, line))
-                continue
+    def unload(self, key, log_callback):
+        del self.translations[key]
+        del self.active[key]
+        gc.collect()
+        log_callback(f"Unloaded idle model {key[0]}->{key[1]} ({self.footprints.get(key, 0) / 1024 ** 2:.0f} MB) "
+                     f"to stay within the memory budget")
+
+    def fit_workers(self, requested, log_callback=None):
+        """Limit concurrent workers to what the memory budget leaves after the resident models"""
+        log_callback = log_callback or print
+        if not self.memory_budget:
+            return requested
+
+        # A model's measured footprint already covers one call, so only the extra workers need room
+        with self.lock:
+            if requested > 1:
+                self.make_room(WorkerTuning.WORKER_MEMORY, log_callback)
+            available = self.memory_budget - self.process_memory()
+        workers = max(1, min(requested, 1 + available // WorkerTuning.WORKER_MEMORY))
+        if workers < requested:
+            log_callback(f"Memory budget allows {workers} of {requested} workers")
+        return workers
+
+    def self_test(self, translation, source_lang, target_lang):
+        """Translate a known sentence, failing early on a broken model and paying the first-call cost up front"""
+        try:
+            result = translation.translate(self.SELF_TEST_TEXT)
+        except Exception as e:
+            raise Exception(f"Model self-test failed for {source_lang}->{target_lang}: {e}")
+        if not result or not result.strip():
+            raise Exception(f"Model self-test failed for {source_lang}->{target_lang}: empty translation")
+
+    def loaded_pairs(self):
+        """List the loaded (source, target, profile) combinations"""
+        with self.lock:
+            return [f"{source}->{target} ({profile[0]})" for source, target, profile in self.translations]
+
+    def describe_memory(self):
+        """Get the process memory, the budget and the footprint of every loaded pair in MB"""
+        with self.lock:
+            return {
+                'resident_mb': round(self.process_memory() / 1024 ** 2),
+                'budget_mb': round(self.memory_budget / 1024 ** 2) if self.memory_budget else None,
+                'models_mb': {f"{source}->{target} ({profile[0]})": round(self.footprints.get(
+                    (source, target, profile), 0) / 1024 ** 2) for source, target, profile in self.translations},
+            }
 
-            if '=' in line:
-                key, value = line.split('=', 1)
-                original_value = value.strip()
 
-                if original_value:
-                    translated_value = self.translate_complex_text(original_value)
-                    new_line = f"{key.strip()}={translated_value}\n"
-                    results.append((line_index, new_line))
-                else:
-                    results.append((line_index, line))
+SEGMENT_LITERAL = 0  # Kept as it is (color code, placeholder, protected term); read back from the source
+SEGMENT_TEXT = 1  # Translated through the segment table
+SEGMENT_REPLACEMENT = 2  # Fixed glossary replacement stored in the segment table
+
+
+class SegmentTable:
+    """Reference-counted segment strings and their translations, addressed by integer IDs"""
+
+    PENDING = -1
+    RETAINED_LIMIT = 16384
+
+    def __init__(self):
+        # Strings live while an in-flight item uses them, plus a bounded set of recently finished ones;
+        # older repeats are answered by the translation memory, so the table never grows with the file
+        self.ids = {}
+        self.strings = []
+        # Translation ID of every string, itself an ID in this table
+        self.translation_ids = array.array('q')
+        self.references = array.array('q')
+        self.free_ids = []
+        self.retained = OrderedDict()
+
+    def intern(self, text):
+        """Get the ID of a string and take a reference to it"""
+        string_id = self.ids.get(text)
+        if string_id is None:
+            if self.free_ids:
+                string_id = self.free_ids.pop()
+                self.strings[string_id] = text
+                self.translation_ids[string_id] = self.PENDING
             else:
-                results.append((line_index, line))
-
-        return results
+                string_id = len(self.strings)
+                self.strings.append(text)
+                self.translation_ids.append(self.PENDING)
+                self.references.append(0)
+            self.ids[text] = string_id
+        elif not self.references[string_id]:
+            del self.retained[string_id]
+        self.references[string_id] += 1
+        return string_id
+
+    def release(self, string_id):
+        """Drop a reference; unused strings are retained for a while, then freed with their translation"""
+        self.references[string_id] -= 1
+        if self.references[string_id]:
+            return
 
-    def translate_file(self):
-        """Translate the properties file"""
-        self.log_callback(f"Reading properties file: {self.source_file}")
+        self.retained[string_id] = None
+        if len(self.retained) > self.RETAINED_LIMIT:
+            self.free(self.retained.popitem(last=False)[0])
+
+    def free(self, string_id):
+        # A translation nothing else refers to goes with its source, instead of displacing another retained string
+        while True:
+            translation_id = self.translation_ids[string_id]
+            del self.ids[self.strings[string_id]]
+            self.strings[string_id] = None
+            self.free_ids.append(string_id)
+            if translation_id == self.PENDING or translation_id == string_id:
+                return
+            self.references[translation_id] -= 1
+            if self.references[translation_id]:
+                return
+            string_id = translation_id
+
+    def is_translated(self, string_id):
+        return self.translation_ids[string_id] != self.PENDING
+
+    def resolve(self, string_id, translation):
+        translation_id = self.intern(translation)
+        # A segment left as it is must not keep itself alive
+        if translation_id == string_id:
+            self.references[string_id] -= 1
+        self.translation_ids[string_id] = translation_id
+
+    def translation(self, string_id):
+        return self.strings[self.translation_ids[string_id]]
+
+
+class PipelineItem:
+    """One source item flowing through the translation pipeline, with its segments as array columns"""
+
+    __slots__ = ('seq', 'key', 'text', 'context', 'kinds', 'ends', 'string_ids', 'missing', 'result')
+
+    def __init__(self, seq, key, text, context):
+        self.seq = seq
+        self.key = key
+        self.text = text
+        self.context = context
+        # Segment kind, end offset in text, and string ID (unused for literals) of every segment
+        self.kinds = None
+        self.ends = None
+        self.string_ids = None
+        # Starts at one so the item is not released while its segments are still being queued
+        self.missing = 1
+        self.result = None
+
+
+class TranslationPipeline:
+    """Asyncio pipeline with bounded queues between read, segment, lookup, inference, reassembly and write"""
+
+    QUEUE_SIZE = 256
+    READ_CHUNK = 256
+    LOG_INTERVAL = 1.0
+
+    def __init__(self, engine, items, write_item, total=None, delay=None):
+        # items yields (key, text, context); a text of None passes the item through untranslated
+        self.engine = engine
+        self.items = items
+        self.write_item = write_item
+        self.total = total
+        self.delay = engine.delay_between_requests if delay is None else delay
+        self.running = None
+        self.loop = None
+        self.main_task = None
+        self.cancelled = False
+        # Batches handed to the executor and not finished yet
+        self.submitted = set()
+
+        self.segments = SegmentTable()
+        self.waiting = {}
+        self.read_count = 0
+        self.written_count = 0
+
+    def cancel(self):
+        """Cancel the pipeline from any thread"""
+        self.cancelled = True
+        loop, task = self.loop, self.main_task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # The loop already finished
+
+    def set_paused(self, paused):
+        """Hold or release the inference stage from any thread"""
+        loop, running = self.loop, self.running
+        if loop is not None and running is not None:
+            try:
+                loop.call_soon_threadsafe(running.clear if paused else running.set)
+            except RuntimeError:
+                pass
 
+    def run(self):
+        """Run the pipeline to completion, returning False if it was cancelled"""
         try:
-            with open(self.source_file, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-        except Exception as e:
-            raise Exception(f"Failed to read source file: {e}")
+            return asyncio.run(self.run_async())
+        except asyncio.CancelledError:
+            return False
 
-        self.log_callback(f"Total lines: {len(lines)}")
+    async def run_async(self):
+        engine = self.engine
+        self.running = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        self.main_task = asyncio.current_task()
+        if not engine.paused:
+            self.running.set()
+        if self.cancelled:
+            return False
+
+        workers = ModelRegistry.shared().fit_workers(max(1, engine.max_workers), engine.log_callback)
+        # A shared executor (e.g. the daemon's) stays alive after this run
+        executor = engine.executor or ThreadPoolExecutor(max_workers=workers)
 
-        # Prepare lines for processing
-        lines_to_process = []
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if line_stripped and not line_stripped.startswith('#') and '=' in line:
-                lines_to_process.append((i, line))
+        segment_queue = asyncio.Queue(self.QUEUE_SIZE)
+        lookup_queue = asyncio.Queue(self.QUEUE_SIZE)
+        inference_queue = asyncio.Queue(self.QUEUE_SIZE)
+        reassembly_queue = asyncio.Queue(self.QUEUE_SIZE)
+        write_queue = asyncio.Queue(self.QUEUE_SIZE)
+
+        inference_tasks = [
+            asyncio.create_task(self.inference_stage(inference_queue, reassembly_queue, executor))
+            for _ in range(workers)
+        ]
+        lookup_task = asyncio.create_task(self.lookup_stage(lookup_queue, inference_queue,
+                                                            reassembly_queue, workers))
+
+        async def close_reassembly():
+            # Every stage feeding the reassembly queue is finished once lookup and inference are
+            await asyncio.gather(lookup_task, *inference_tasks)
+            await reassembly_queue.put(None)
+
+        tasks = [
+            asyncio.create_task(self.read_stage(segment_queue)),
+            asyncio.create_task(self.segment_stage(segment_queue, lookup_queue, reassembly_queue)),
+            lookup_task,
+            *inference_tasks,
+            asyncio.create_task(close_reassembly()),
+            asyncio.create_task(self.reassembly_stage(reassembly_queue, write_queue)),
+            asyncio.create_task(self.write_stage(write_queue)),
+        ]
 
-        self.log_callback(f"Lines to process: {len(lines_to_process)}")
+        try:
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            return True
+        except asyncio.CancelledError:
+            # Also reached on Ctrl+C; batches already on the executor stop at their next segment
+            self.cancelled = True
+            engine.stop_translation = True
+            engine.resume_event.set()
+            raise
+        finally:
+            # Batches still waiting for a worker are dropped; shutdown(cancel_futures=) needs Python 3.9
+            for future in self.submitted:
+                future.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if executor is not engine.executor:
+                executor.shutdown(wait=not self.cancelled)
+
+    def read_chunk(self, iterator):
+        return list(itertools.islice(iterator, self.READ_CHUNK))
+
+    async def read_stage(self, out_queue):
+        """Read and parse source items off the event loop thread"""
+        iterator = iter(self.items)
+        while True:
+            chunk = await self.loop.run_in_executor(None, self.engine.worker_call, self.read_chunk, iterator)
+            for item in chunk:
+                await out_queue.put(item)
+            self.read_count += len(chunk)
+            if len(chunk) < self.READ_CHUNK:
+                break
+        await out_queue.put(None)
+
+    async def segment_stage(self, in_queue, lookup_queue, reassembly_queue):
+        """Split items into segments and queue every distinct segment for lookup once"""
+        engine = self.engine
+        seq = 0
+        while True:
+            entry = await in_queue.get()
+            if entry is None:
+                break
 
-        # Create batches
-        batches = []
-        for i in range(0, len(lines_to_process), self.batch_size):
-            batch = lines_to_process[i:i + self.batch_size]
-            batches.append(batch)
+            key, text, context = entry
+            item = PipelineItem(seq, key, text, context)
+            seq += 1
 
-        self.log_callback(f"Processing {len(batches)} batches with {self.max_workers} workers")
+            if text is None or engine.should_ignore(text):
+                item.result = text
+                item.missing = 0
+                await reassembly_queue.put(item)
+                continue
 
-        # Process batches
-        translated_results = {}
-        processed_batches = 0
+            item.kinds = bytearray()
+            item.ends = array.array('l')
+            item.string_ids = array.array('q')
+            segments = self.segments
+            for kind, end, part in engine.iter_segment_spans(text):
+                item.kinds.append(kind)
+                item.ends.append(end)
+                if kind == SEGMENT_LITERAL:
+                    item.string_ids.append(SegmentTable.PENDING)
+                    continue
+
+                string_id = segments.intern(part)
+                item.string_ids.append(string_id)
+                if kind == SEGMENT_TEXT and not segments.is_translated(string_id):
+                    item.missing += 1
+                    waiters = self.waiting.get(string_id)
+                    if waiters is None:
+                        self.waiting[string_id] = [item]
+                        await lookup_queue.put(string_id)
+                    else:
+                        waiters.append(item)
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            if self.stop_translation:
-                return
+            await self.release(item, reassembly_queue)
 
-            future_to_batch = {
-                executor.submit(self.process_batch, batch): i
-                for i, batch in enumerate(batches)
-            }
+        await lookup_queue.put(None)
 
-            for future in as_completed(future_to_batch):
-                if self.stop_translation:
-                    break
+    async def lookup_stage(self, in_queue, inference_queue, reassembly_queue, workers):
+        """Answer segments from the translation memory and filters, passing the rest to inference"""
+        while True:
+            string_id = await in_queue.get()
+            if string_id is None:
+                break
+            result = self.engine.lookup_text(self.segments.strings[string_id])
+            if result is None:
+                await inference_queue.put(string_id)
+            else:
+                await self.resolve(string_id, result, reassembly_queue)
+
+        for _ in range(workers):
+            await inference_queue.put(None)
+
+    async def inference_stage(self, in_queue, reassembly_queue, executor):
+        """Translate batches of segments with the model on the executor"""
+        engine = self.engine
+        finished = False
+        while not finished:
+            string_id = await in_queue.get()
+            if string_id is None:
+                break
 
+            batch = [string_id]
+            while len(batch) < engine.batch_size:
                 try:
-                    batch_results = future.result()
-                    for line_index, translated_line in batch_results:
-                        translated_results[line_index] = translated_line
+                    string_id = in_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if string_id is None:
+                    finished = True
+                    break
+                batch.append(string_id)
 
-                    processed_batches += 1
-                    self.progress_callback(processed_batches, len(batches))
-                    self.log_callback(f"Processed batch {processed_batches}/{len(batches)}")
+            # A paused pipeline keeps its queued work and dispatches nothing new
+            await self.running.wait()
+            parts = [self.segments.strings[string_id] for string_id in batch]
+            future = executor.submit(engine.worker_call, engine.translate_segment_batch, parts)
+            self.submitted.add(future)
+            try:
+                results = await asyncio.wrap_future(future)
+            finally:
+                self.submitted.discard(future)
+            for string_id, result in zip(batch, results):
+                await self.resolve(string_id, result, reassembly_queue)
+
+            if self.delay:
+                await asyncio.sleep(self.delay)
+
+    async def resolve(self, string_id, result, reassembly_queue):
+        """Record a segment translation and release the items waiting for it"""
+        self.segments.resolve(string_id, result)
+        for item in self.waiting.pop(string_id, ()):
+            await self.release(item, reassembly_queue)
+
+    async def release(self, item, reassembly_queue):
+        item.missing -= 1
+        if item.missing == 0:
+            await reassembly_queue.put(item)
+
+    def assemble(self, item):
+        """Get the output pieces of an item from its segment columns"""
+        segments = self.segments
+        text = item.text
+        pieces = []
+        start = 0
+        for kind, end, string_id in zip(item.kinds, item.ends, item.string_ids):
+            if kind == SEGMENT_LITERAL:
+                pieces.append(text[start:end])
+            elif kind == SEGMENT_TEXT:
+                pieces.append(segments.translation(string_id))
+            else:
+                pieces.append(segments.strings[string_id])
+            start = end
+        return pieces
+
+    async def reassembly_stage(self, in_queue, write_queue):
+        """Join translated segments back into complete values"""
+        while True:
+            item = await in_queue.get()
+            if item is None:
+                break
+            if item.kinds is not None:
+                item.result = self.engine.join_segments(self.assemble(item))
+                for kind, string_id in zip(item.kinds, item.string_ids):
+                    if kind != SEGMENT_LITERAL:
+                        self.segments.release(string_id)
+                item.kinds = item.ends = item.string_ids = None
+            await write_queue.put(item)
+        await write_queue.put(None)
+
+    async def write_stage(self, in_queue):
+        """Hand finished items to the writer in source order"""
+        engine = self.engine
+        pending = {}
+        next_seq = 0
+        last_log = time.monotonic()
+        while True:
+            item = await in_queue.get()
+            if item is None:
+                break
 
-                    time.sleep(self.delay_between_requests)
+            pending[item.seq] = item
+            while next_seq in pending:
+                item = pending.pop(next_seq)
+                self.write_item(item.key, item.context, item.result)
+                next_seq += 1
 
-                except Exception as e:
-                    self.log_callback(f"Batch processing error: {e}")
+            self.written_count = next_seq
+            total = self.total or self.read_count
+            engine.progress_callback(self.written_count, max(total, self.written_count))
+            if time.monotonic() - last_log >= self.LOG_INTERVAL:
+                last_log = time.monotonic()
+                engine.log_callback(f"Processed {self.written_count}/{total} items")
 
-        if self.stop_translation:
-            self.log_callback("Translation stopped by user")
-            return
 
-        # Update original lines
-        for line_index, translated_line in translated_results.items():
-            lines[line_index] = translated_line
+def temporary_output_path(path):
+    """Get a hidden temporary path next to an output file"""
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
 
-        # Save results
-        try:
-            os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                f.writelines(lines)
-            self.log_callback(f"Translation completed! Saved to: {self.output_file}")
-            self.log_callback(f"Cache entries: {len(self.translation_cache)}")
-        except Exception as e:
-            raise Exception(f"Failed to save output file: {e}")
 
+def fsync_directory(directory):
+    """Make renames inside a directory durable (not possible on Windows)"""
+    if os.name == 'nt':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
-class YamlTranslatorEngine(BaseTranslatorEngine):
-    """Translator engine for YAML files"""
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        # Configure YAML to preserve order and formatting
-        self.yaml_loader = yaml.SafeLoader
-        self.yaml_dumper = yaml.SafeDumper
+class AtomicOutput:
+    """Output file written under a temporary name and renamed into place only when complete"""
+
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, path, encoding=None, writer=None):
+        # Text is encoded incrementally so a BOM is written only once; without an encoding data is bytes
+        self.path = path
+        self.encoder = codecs.getincrementalencoder(encoding)() if encoding else None
+        self.writer = writer
+        self.discarded = False
+        self.temp_path = None
+
+        if writer is not None:
+            # Multi-file runs hand the finished content to the background writer
+            self.file = io.BytesIO()
+        else:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.temp_path = temporary_output_path(path)
+            self.file = open(self.temp_path, 'wb', buffering=self.BUFFER_SIZE)
+
+    def write(self, data):
+        if self.encoder is not None:
+            data = self.encoder.encode(data)
+        self.file.write(data)
+
+    def discard(self):
+        """Drop the output instead of replacing the target when the block ends"""
+        self.discarded = True
+
+    def commit(self):
+        if self.writer is not None:
+            self.writer.submit(self.path, self.file.getvalue())
+            return
+
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+        fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+
+    def abort(self):
+        self.file.close()
+        if self.temp_path and os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None or self.discarded:
+            self.abort()
+            return False
+        try:
+            self.commit()
+        except Exception:
+            self.abort()
+            raise
+        return False
+
+
+class OutputWriter:
+    """Background thread that writes finished outputs atomically, syncing them to disk in groups"""
+
+    GROUP_SIZE = 64
+    QUEUE_SIZE = 256
+
+    def __init__(self, log_callback=None, group_size=None):
+        self.log_callback = log_callback or print
+        self.group_size = group_size or self.GROUP_SIZE
+        # Bounded, so translation slows down instead of buffering unlimited output when the disk lags
+        self.queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self.errors = []
+        self.written = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data):
+        """Queue the complete content of an output file"""
+        self.queue.put((path, data))
+
+    def run(self):
+        group = []
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            group.append(self.write_temporary(*item))
+            if len(group) >= self.group_size or self.queue.empty():
+                self.commit_group(group)
+                group = []
+        self.commit_group(group)
+
+    def write_temporary(self, path, data):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            temp_path = temporary_output_path(path)
+            f = open(temp_path, 'wb', buffering=AtomicOutput.BUFFER_SIZE)
+            f.write(data)
+            return path, temp_path, f
+        except Exception as e:
+            self.fail(path, e)
+            return path, None, None
+
+    def commit_group(self, group):
+        """Sync a group of temporary files, rename them into place, then sync their directories once"""
+        directories = set()
+        for path, temp_path, f in group:
+            if f is None:
+                continue
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+                os.replace(temp_path, path)
+                directories.add(os.path.dirname(os.path.abspath(path)))
+                self.written += 1
+            except Exception as e:
+                f.close()
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                self.fail(path, e)
+
+        for directory in directories:
+            try:
+                fsync_directory(directory)
+            except OSError:
+                pass
+
+    def fail(self, path, error):
+        self.errors.append((path, error))
+        self.log_callback(f"Failed to write {path}: {error}")
+
+    def close(self):
+        """Wait until every queued output is on disk"""
+        self.queue.put(None)
+        self.thread.join()
+        if self.errors:
+            path, error = self.errors[0]
+            raise Exception(f"Failed to write {len(self.errors)} output files, first {path}: {error}")
+
+
+class RunProfiler:
+    """Opt-in profiling of a translation run, with cProfile or sampled stacks of every thread"""
+
+    MODES = ('cprofile', 'sample')
+    TOP = 25
+    SAMPLE_INTERVAL = 0.005
+    MAX_DEPTH = 128
+    # A thread whose innermost Python frame is one of these is waiting, not working
+    IDLE_FUNCTIONS = {('threading.py', 'wait'), ('queue.py', 'get'), ('selectors.py', 'select'),
+                      ('thread.py', '_worker'), ('threading.py', '_wait_for_tstate_lock')}
+
+    def __init__(self, mode, top=None, log_callback=None):
+        if mode not in self.MODES:
+            raise Exception(f"Unknown profiler '{mode}', use one of: {', '.join(self.MODES)}")
+        self.mode = mode
+        self.top = top or self.TOP
+        self.log_callback = log_callback or print
+        self.active = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.thread_profilers = []
+        self.stacks = {}
+        self.sample_count = 0
+        self.idle_count = 0
+        self.stop_event = threading.Event()
+
+    def run(self, func, output_file):
+        """Profile one call of func and save the profile next to output_file"""
+        if self.mode == 'cprofile' and sys.version_info >= (3, 12):
+            # cProfile became a single process-wide sys.monitoring tool, so worker threads cannot have their own
+            self.log_callback("cProfile cannot profile worker threads on Python 3.12+, sampling stacks instead")
+            self.mode = 'sample'
+        if self.mode == 'cprofile':
+            return self.run_cprofile(func, output_file)
+        return self.run_sampled(func, output_file)
+
+    def call(self, func, *args):
+        """Run work handed to a worker thread under that thread's own profiler"""
+        if not self.active or self.mode != 'cprofile':
+            return func(*args)
+        profiler = getattr(self.local, 'profiler', None)
+        if profiler is None:
+            profiler = self.local.profiler = cProfile.Profile()
+            with self.lock:
+                self.thread_profilers.append(profiler)
+        # Profiling must never fail the work itself
+        try:
+            profiler.enable()
+        except Exception:
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            profiler.disable()
+
+    def run_cprofile(self, func, output_file):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except Exception as e:
+            self.log_callback(f"Profiler unavailable, translating without it: {e}")
+            return func()
+        self.active = True
+        try:
+            return func()
+        finally:
+            profiler.disable()
+            self.active = False
+            with self.lock:
+                thread_profilers, self.thread_profilers = self.thread_profilers, []
+            try:
+                stats = pstats.Stats(profiler)
+                for thread_profiler in thread_profilers:
+                    stats.add(thread_profiler)
+                path = f"{output_file}.prof"
+                stats.dump_stats(path)
+                self.log_cprofile_summary(stats, path, len(thread_profilers) + 1)
+            except Exception as e:
+                self.log_callback(f"Could not save profile: {e}")
+
+    def log_cprofile_summary(self, stats, path, thread_count):
+        total = sum(tt for cc, nc, tt, ct, callers in stats.stats.values())
+        self.log_callback(f"Profile saved to {path} ({total:.2f}s of profiled time across "
+                          f"{thread_count} threads), top {self.top} by cumulative time:")
+        self.log_callback(f"{'cumulative':>11} {'own':>9} {'calls':>9}  function")
+        entries = sorted(stats.stats.items(), key=lambda entry: entry[1][3], reverse=True)
+        for (filename, line, name), (cc, nc, tt, ct, callers) in entries[:self.top]:
+            self.log_callback(f"{ct:10.3f}s {tt:8.3f}s {nc:9}  {self.function_label(filename, line, name)}")
+
+    def run_sampled(self, func, output_file):
+        self.stop_event.clear()
+        sampler = threading.Thread(target=self.sample, daemon=True)
+        sampler.start()
+        try:
+            return func()
+        finally:
+            self.stop_event.set()
+            sampler.join()
+            path = f"{output_file}.folded"
+            try:
+                self.save_folded(path)
+                self.log_sample_summary(path)
+            except Exception as e:
+                self.log_callback(f"Could not save profile: {e}")
+
+    def sample(self):
+        """Record the stack of every busy thread at a fixed interval"""
+        names = {}
+        sampler_ident = threading.get_ident()
+        while not self.stop_event.wait(self.SAMPLE_INTERVAL):
+            frames = sys._current_frames()
+            if len(names) != len(frames):
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == sampler_ident:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in self.IDLE_FUNCTIONS:
+                    self.idle_count += 1
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.MAX_DEPTH:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                key = (names.get(ident, str(ident)), tuple(reversed(stack)))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+                self.sample_count += 1
+            del frames
+
+    def save_folded(self, path):
+        """Write the samples in the folded format read by flamegraph tools"""
+        with AtomicOutput(path, 'utf-8') as f:
+            for (thread_name, stack), count in sorted(self.stacks.items(), key=lambda entry: -entry[1]):
+                labels = [thread_name] + [self.function_label(*function) for function in stack]
+                f.write(f"{';'.join(label.replace(';', ',') for label in labels)} {count}\n")
+
+    def log_sample_summary(self, path):
+        inclusive = {}
+        own = {}
+        for (thread_name, stack), count in self.stacks.items():
+            for function in set(stack):
+                inclusive[function] = inclusive.get(function, 0) + count
+            if stack:
+                own[stack[-1]] = own.get(stack[-1], 0) + count
+
+        total = max(self.sample_count, 1)
+        self.log_callback(f"Profile saved to {path} ({self.sample_count} busy samples, "
+                          f"{self.idle_count} idle), top {self.top} by inclusive samples:")
+        self.log_callback(f"{'inclusive':>10} {'own':>7}  function")
+        entries = sorted(inclusive.items(), key=lambda entry: entry[1], reverse=True)
+        for function, count in entries[:self.top]:
+            self.log_callback(f"{count / total:9.1%} {own.get(function, 0) / total:7.1%}  "
+                              f"{self.function_label(*function)}")
+
+    @staticmethod
+    def function_label(filename, line, name):
+        if filename == '~':
+            return name
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class KeyPathRules:
+    """Include/exclude globs over key paths, matched incrementally while walking a document"""
+
+    DEEP = '**'
+    INDEX_PATTERN = re.compile(r'\[(\d+|\*)\]')
+
+    # Built-in rule sets, used as @name inside a rule list
+    PROFILES = {
+        'messages': ['messages.**', 'lang.**', '**.message', '**.messages.**', '**.lore[*]', '**.display-name',
+                     '**.display_name', '**.title', '**.subtitle', '**.description', '**.prefix'],
+        'config': ['!database.**', '!mysql.**', '!storage.**', '!redis.**', '!**.permission', '!**.permissions.**',
+                   '!**.material', '!**.sound', '!**.host', '!**.password', '!**.world', '!**.worlds.**'],
+        'deluxemenus': ['menu_title', '**.display_name', '**.lore[*]'],
+        'essentialsx': ['custom-join-message', 'custom-quit-message', 'newbies.announce-format',
+                        'chat.format', 'chat.group-formats.*'],
+    }
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.patterns = []
+        self.includes = []
+        for rule in self.rules:
+            include = not rule.startswith('!')
+            self.patterns.append(self.parse_pattern(rule if include else rule[1:]))
+            self.includes.append(include)
+        # Without include rules everything not excluded is translated
+        self.default_include = not any(self.includes)
+
+    @classmethod
+    def parse(cls, text):
+        """Build rules from a comma or whitespace separated list, or None when it is empty"""
+        if not text:
+            return None
+        if isinstance(text, str):
+            text = re.split(r'[,\s]+', text)
+        rules = []
+        for rule in text:
+            if not rule:
+                continue
+            if rule.startswith('@'):
+                name = rule[1:].lower()
+                if name not in cls.PROFILES:
+                    raise Exception(f"Unknown key rule profile '{name}' (choose from {', '.join(cls.PROFILES)})")
+                rules.extend(cls.PROFILES[name])
+            else:
+                rules.append(rule)
+        return cls(rules) if rules else None
+
+    @classmethod
+    def parse_pattern(cls, rule):
+        """Split a glob like items.*.lore[*] into key, index and ** tokens"""
+        tokens = []
+        for part in rule.split('.'):
+            key, bracket, rest = part.partition('[')
+            indexes = bracket + rest
+            if key == cls.DEEP:
+                tokens.append(cls.DEEP)
+            elif key:
+                if '*' in key or '?' in key:
+                    glob = re.escape(key).replace(r'\*', '.*').replace(r'\?', '.')
+                    tokens.append(('key', re.compile(glob)))
+                else:
+                    tokens.append(('key', key))
+            elif not indexes:
+                raise Exception(f"Empty segment in key rule '{rule}'")
+            position = 0
+            for match in cls.INDEX_PATTERN.finditer(indexes):
+                if match.start() != position:
+                    break
+                index = match.group(1)
+                tokens.append(('index', None if index == '*' else int(index)))
+                position = match.end()
+            if position != len(indexes):
+                raise Exception(f"Invalid list index in key rule '{rule}'")
+        return tokens
+
+    @staticmethod
+    def token_matches(part, token):
+        kind, expected = part
+        if kind != token[0]:
+            return False
+        if expected is None:
+            return True
+        if isinstance(expected, re.Pattern):
+            return expected.fullmatch(token[1]) is not None
+        return expected == token[1]
+
+    def closure(self, pattern, positions):
+        """Let every ** also match zero segments"""
+        for position in sorted(positions):
+            while position < len(pattern) and pattern[position] is self.DEEP:
+                position += 1
+                positions.add(position)
+        return frozenset(positions)
+
+    def advance(self, decision, states):
+        # A rule matching a node decides for its whole subtree, the last matching rule wins
+        for index, (pattern, positions) in enumerate(zip(self.patterns, states)):
+            if index > decision and len(pattern) in positions:
+                decision = index
+        include = self.includes[decision] if decision >= 0 else self.default_include
+        if not include and not any(self.includes[index] and states[index]
+                                   for index in range(decision + 1, len(self.patterns))):
+            # Excluded, and no later include rule can match below: skip the subtree
+            return None
+        return decision, tuple(states)
+
+    def root(self):
+        """Matcher state of the document root"""
+        return self.advance(-1, [self.closure(pattern, {0}) for pattern in self.patterns])
+
+    def step(self, state, token):
+        """State of the child ('key', name) or ('index', i), or None when nothing below can be included"""
+        decision, states = state
+        following = []
+        for pattern, positions in zip(self.patterns, states):
+            reached = set()
+            for position in positions:
+                if position == len(pattern):
+                    continue
+                part = pattern[position]
+                if part is self.DEEP:
+                    reached.add(position)
+                elif self.token_matches(part, token):
+                    reached.add(position + 1)
+            following.append(self.closure(pattern, reached))
+        return self.advance(decision, following)
+
+    def includes_state(self, state):
+        decision = state[0]
+        return self.includes[decision] if decision >= 0 else self.default_include
+
+    def allows(self, key):
+        """Whether a dotted key, like a .properties key, is translated"""
+        state = self.root()
+        for name in key.split('.'):
+            if state is None:
+                return False
+            state = self.step(state, ('key', name))
+        return state is not None and self.includes_state(state)
+
+
+class BaseTranslatorEngine(abc.ABC):
+    """Base class for translation engines"""
+
+    def __init__(self, source_file, output_file, source_lang, target_lang,
+                 max_workers=2, batch_size=5, delay_between_requests=0.3,
+                 log_callback=None, progress_callback=None, skip_target_language=False,
+                 glossary_file=None, fuzzy_threshold=0.0, cache_limit_mb=None, dry_run=False,
+                 performance_profile='default', executor=None, incremental=False, output_writer=None,
+                 profiler=None, profile_top=None, memory_budget_mb=None, translation_engine=None,
+                 key_rules=None):
+        self.source_file = source_file
+        self.output_file = output_file
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.delay_between_requests = delay_between_requests
+        self.executor = executor
+        self.output_writer = output_writer
+        self.log_callback = log_callback or print
+        self.progress_callback = progress_callback or (lambda x, y: None)
+        if isinstance(performance_profile, PerformanceProfile):
+            self.performance_profile = performance_profile
+        else:
+            self.performance_profile = PerformanceProfile.get(performance_profile or 'default')
+
+        # Opt-in profiling of translate_file_with_profiler runs
+        self.profiler = RunProfiler(profiler, profile_top, self.log_callback) if profiler else None
+
+        # Key-path rules limit translation to message-like keys
+        self.key_rules = KeyPathRules.parse(key_rules)
+        self.pruned_count = 0
+
+        self.source_encoding = None
+        # Set when the sniffed UTF-8 turned out wrong further into the file
+        self.encoding_override = None
+        self.stop_translation = False
+        self.pipeline = None
+        self.resume_event = threading.Event()
+        self.resume_event.set()
+
+        # Source and result of every item from the previous run, used to re-translate only changed keys
+        self.incremental = incremental
+        self.previous_sources = {}
+        self.previous_results = {}
+        self.current_sources = {}
+        self.current_results = {}
+        self.reused_count = 0
+
+        self.translation_cache = TranslationCache.shared()
+        if cache_limit_mb:
+            self.translation_cache.resize(int(cache_limit_mb * 1024 * 1024))
+        if memory_budget_mb is not None:
+            ModelRegistry.shared().set_memory_budget(memory_budget_mb)
+        self.translation_lock = threading.Lock()
+        self.translation_memory = TranslationMemory(self.translation_cache, fuzzy_threshold,
+                                                    namespace=f"{source_lang}>{target_lang}\x1f")
+
+        # Language pre-filter statistics
+        self.language_identifier = LanguageIdentifier.default() if skip_target_language else None
+        self.language_skip_count = 0
+        self.untranslated_count = 0
+        self.stats_lock = threading.Lock()
+
+        # Model call statistics used for throughput measurements
+        self.model_calls = 0
+        self.model_chars = 0
+
+        # A dry run never loads the model
+        self.dry_run = dry_run
+        self.model_key = None
+        self.model_depth = 0
+        if dry_run:
+            self.translation_engine = None
+        elif translation_engine is not None:
+            # A ready translation object, e.g. the regression harness stub
+            self.translation_engine = translation_engine
+        else:
+            self.setup_translation()
+        self.compile_ignore_patterns()
+
+        self.glossary = None
+        if glossary_file:
+            try:
+                self.glossary = Glossary.load(glossary_file, self.log_callback)
+            except Exception as e:
+                raise Exception(f"Failed to load glossary: {e}")
+
+        # 'auto' settings are calibrated when the first run starts, where Stop can interrupt the calibration
+        self.pending_tuning = None
+        if WorkerTuning.AUTO in (max_workers, batch_size):
+            self.pending_tuning = (max_workers, batch_size)
+
+    def resolve_worker_settings(self):
+        """Apply pending 'auto' worker and batch settings before a run"""
+        if self.pending_tuning is None:
+            return
+        max_workers, batch_size = self.pending_tuning
+        self.pending_tuning = None
+        self.apply_worker_tuning(max_workers, batch_size)
+
+    def apply_worker_tuning(self, max_workers, batch_size):
+        """Replace 'auto' workers with the calibration for this machine and pair, 'auto' batch with the default"""
+        workers, tuned_batch_size = WorkerTuning.tune(self)
+        if max_workers == WorkerTuning.AUTO:
+            self.max_workers = workers
+        if batch_size == WorkerTuning.AUTO:
+            self.batch_size = tuned_batch_size
+        self.log_callback(f"Auto-tuned: {self.max_workers} workers, batch size {self.batch_size}")
+
+    def detect_source_encoding(self):
+        """Encoding of the source: sniffed from its prefix, unless a full read proved the guess wrong"""
+        return self.encoding_override or detect_encoding(self.source_file)
+
+    def fall_back_encoding(self):
+        """Switch to Latin-1 after a decode error behind the sniffed prefix; False if that cannot help"""
+        if self.encoding_override is not None or self.source_encoding != 'utf-8':
+            return False
+        self.log_callback("Source is not valid UTF-8 beyond the sniffed prefix, reading it as Latin-1")
+        self.encoding_override = 'latin-1'
+        return True
+
+    def open_source(self, newline=None):
+        """Open the source file as a text stream in its detected encoding"""
+        try:
+            self.source_encoding = self.detect_source_encoding()
+            return open(self.source_file, 'r', encoding=self.source_encoding, newline=newline)
+        except Exception as e:
+            raise Exception(f"Failed to read source file: {e}")
+
+    def setup_translation(self):
+        """Setup translation engine"""
+        # Loaded models are shared so later engines for the same pair start warm
+        self.translation_engine = ModelRegistry.shared().get_translation(
+            self.source_lang, self.target_lang, self.performance_profile, self.log_callback)
+        self.model_key = ModelRegistry.model_key(self.source_lang, self.target_lang, self.performance_profile)
+
+    def acquire_model(self):
+        """Mark the shared model as in use for a run, reloading it if it was unloaded while idle"""
+        if self.model_key is None:
+            return
+        if self.model_depth == 0:
+            self.translation_engine = ModelRegistry.shared().get_translation(
+                self.source_lang, self.target_lang, self.performance_profile, self.log_callback, acquire=True)
+        self.model_depth += 1
+
+    def release_model(self):
+        """End the use taken by acquire_model, so the memory budget may unload the model again"""
+        if self.model_key is None:
+            return
+        self.model_depth -= 1
+        if self.model_depth == 0:
+            ModelRegistry.shared().release(self.model_key)
+
+    def translate_file(self):
+        """Translate the source file, keeping the model in use for the whole run"""
+        self.acquire_model()
+        try:
+            self.resolve_worker_settings()
+            return self.translate_document()
+        finally:
+            self.release_model()
+
+    # Enhanced split pattern that properly handles Minecraft color codes; every match is kept as it is
+    SPLIT_PATTERN = re.compile(
+        r'('
+        r'&[0-9a-fk-or]|'  # Minecraft color codes (& followed by valid color/formatting code)
+        r'§[0-9a-fk-or]|'  # Minecraft section sign color codes
+        r'%[^%]*%|'  # Placeholder patterns
+        r'<[^<>]*>|'  # HTML/XML tags
+        r'\{[^{}]*\}|'  # JSON/bracket placeholders
+        r'\[[^\[\]]*\]|'  # Square bracket placeholders
+        r'minecraft:[a-zA-Z0-9_]+(?:[./][a-zA-Z0-9_]+)*|'  # Minecraft namespaced IDs like minecraft:ui.button.click
+        r'https?://\S+|'  # URLs
+        r'/\w+|'  # Commands
+        r'\b[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+\b|'  # Material and enum names like DIAMOND_SWORD
+        r'\b[a-zA-Z0-9_.]+\.[a-zA-Z0-9_.]+\b'  # Domain-like patterns
+        r')'
+    )
+
+    # Words and punctuation, the unit of the dry-run token estimate
+    TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]')
+
+    def compile_ignore_patterns(self):
+        """Compile ignore patterns with fixed Minecraft color code handling"""
+        patterns = [
+            r'%[^%]*%',  # Placeholder patterns like %player%
+            r'<[^<>]*>',  # HTML/XML tags
+            r'\{[^{}]*\}',  # JSON/bracket placeholders
+            r'\[[^\[\]]*\]',  # Square bracket placeholders
+            r'minecraft:[a-zA-Z0-9_]+(?:[./][a-zA-Z0-9_]+)*',  # Minecraft namespaced IDs
+            r'\b(sound|particle|block|entity|item|effect|enchantment|potion|biome|dimension)\.[a-zA-Z0-9_.]+\b',
+            # Technical terms
+            r'[=+\-*/]',  # Math operators
+            r'\b[a-zA-Z0-9_]+\.[a-zA-Z0-9_.]+\b',  # Domain-like patterns
+            r'https?://\S+',  # URLs
+            r'^\d+$',  # Numbers only
+            r'^[^\w\s]+$',  # Special characters only
+            r'^\w$'  # Single characters
+        ]
+
+        self.ignore_patterns = re.compile('|'.join(f'({pattern})' for pattern in patterns))
+
+        self.split_pattern = self.SPLIT_PATTERN
+
+        # Pattern to identify Minecraft color codes specifically
+        self.minecraft_color_pattern = re.compile(r'[&§][0-9a-fk-or]')
+
+    def key_allowed(self, key):
+        """Whether the key-path rules let this key be translated"""
+        return self.key_rules is None or self.key_rules.allows(key)
+
+    def should_ignore(self, text):
+        """Check if text should be ignored"""
+        if not text or not text.strip() or len(text.strip()) <= 2:
+            return True
+
+        # Check if it's a Minecraft color code
+        if self.minecraft_color_pattern.fullmatch(text.strip()):
+            return True
+
+        return bool(self.ignore_patterns.fullmatch(text.strip()))
+
+    def translate_text(self, text):
+        """Translate text with caching"""
+        result = self.lookup_text(text)
+        if result is not None:
+            return result
+        return self.translate_with_model(text)
+
+    def lookup_text(self, text):
+        """Answer text without the model, or return None if the model is needed"""
+        if not text or self.should_ignore(text):
+            return text
+
+        text_key = text.strip()
+        # Whitespace around the segment separates it from neighbouring placeholders and terms
+        leading = text[:len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()):]
+
+        cached = self.translation_memory.lookup(text_key)
+        if cached is not None:
+            return leading + cached + trailing
+
+        # Skip the model for segments that are already translated or in another language
+        if self.language_identifier and self.language_identifier.should_skip(
+                text_key, self.source_lang, self.target_lang):
+            with self.stats_lock:
+                self.language_skip_count += 1
+            return text
+
+        # Without a loaded model (dry run or offline merge) only the translation memory can answer
+        if self.translation_engine is None:
+            with self.stats_lock:
+                self.untranslated_count += 1
+            return text
+
+        return None
+
+    def translate_with_model(self, text):
+        """Translate a segment with the model and remember the result"""
+        text_key = text.strip()
+        leading = text[:len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()):]
+
+        try:
+            # CTranslate2 is thread-safe, so only the bookkeeping is serialized, not the model call
+            result = self.translation_engine.translate(text_key)
+            with self.translation_lock:
+                self.model_calls += 1
+                self.model_chars += len(text_key)
+            if result:
+                self.translation_memory.remember(text_key, result)
+                return leading + result + trailing
+        except Exception as e:
+            self.log_callback(f"Translation error for '{text}': {e}")
+
+        return text
+
+    def iter_segments(self, text):
+        """Yield (part, needs_translation) pairs for the pieces of a complex text"""
+        for kind, end, part in self.iter_segment_spans(text):
+            yield part, kind == SEGMENT_TEXT
+
+    def iter_segment_spans(self, text):
+        """Yield (kind, end offset, part) for the pieces of a complex text"""
+        position = 0
+        # Split the text while preserving Minecraft color codes and other special patterns
+        for index, part in enumerate(self.split_pattern.split(text)):
+            if not part:  # Skip empty parts
+                continue
+
+            # Odd parts are the color codes, placeholders, IDs, commands, URLs, etc. and are kept as they are
+            if index % 2:
+                position += len(part)
+                yield SEGMENT_LITERAL, position, part
+                continue
+
+            # Glossary terms are protected (or replaced) only in the free text between those patterns,
+            # so a term never matches inside a placeholder like {player}
+            chunks = self.glossary.split(part) if self.glossary else [(part, None)]
+            for chunk, replacement in chunks:
+                position += len(chunk)
+                if replacement is not None:
+                    yield (SEGMENT_LITERAL if replacement == chunk else SEGMENT_REPLACEMENT), position, replacement
+                elif self.should_ignore(chunk):
+                    yield SEGMENT_LITERAL, position, chunk
+                else:
+                    yield SEGMENT_TEXT, position, chunk
+
+    def translate_complex_text(self, text):
+        """Translate complex text by splitting it properly for Minecraft formatting"""
+        if self.should_ignore(text):
+            return text
+
+        return self.join_segments([
+            self.translate_text(part) if needs_translation else part
+            for part, needs_translation in self.iter_segments(text)
+        ])
+
+    def join_segments(self, parts):
+        """Join translated segments back into one value"""
+        result = ''.join(parts)
+
+        # Clean up spacing issues around color codes
+        # Remove spaces between color codes and following text
+        result = re.sub(r'([&§][0-9a-fk-or])\s+', r'\1', result)
+
+        return result
+
+    def translate_file_with_profiler(self):
+        """Translate the file, under the profiler when one is enabled"""
+        if self.profiler:
+            return self.profiler.run(self.translate_file, self.output_file)
+        return self.translate_file()
+
+    def worker_call(self, func, *args):
+        """Run pipeline work on a worker thread, under the profiler when one is enabled"""
+        if self.profiler:
+            return self.profiler.call(func, *args)
+        return func(*args)
+
+    def translate_segment_batch(self, parts):
+        """Translate a batch of segments with the model, stopping early when requested"""
+        results = []
+        for part in parts:
+            # A pause holds the batch between segments
+            self.resume_event.wait()
+            if self.stop_translation:
+                results.append(part)
+            else:
+                results.append(self.translate_with_model(part))
+        return results
+
+    def run_pipeline(self, items, write_item, total=None, delay=None):
+        """Stream (key, text, context) items through the translation pipeline"""
+        if self.stop_translation:
+            return False
+        self.pipeline = TranslationPipeline(self, items, write_item, total, delay)
+        try:
+            return self.pipeline.run() and not self.stop_translation
+        finally:
+            self.pipeline = None
+
+    def request_stop(self):
+        """Stop the running translation as soon as possible"""
+        self.stop_translation = True
+        # Workers held by a pause must wake up to see the stop
+        self.resume_event.set()
+        pipeline = self.pipeline
+        if pipeline is not None:
+            pipeline.cancel()
+
+    @property
+    def paused(self):
+        return not self.resume_event.is_set()
+
+    def pause(self):
+        """Hold new model work until resume() is called, keeping everything already translated"""
+        self.resume_event.clear()
+        pipeline = self.pipeline
+        if pipeline is not None:
+            pipeline.set_paused(True)
+
+    def resume(self):
+        """Continue a paused translation"""
+        self.resume_event.set()
+        pipeline = self.pipeline
+        if pipeline is not None:
+            pipeline.set_paused(False)
+
+    def reused_result(self, key, source):
+        """Get the previous run's result for an unchanged item, or None"""
+        if self.incremental and self.previous_sources.get(key) == source:
+            return self.previous_results.get(key)
+        return None
+
+    def start_incremental_run(self):
+        self.current_sources = {}
+        self.current_results = {}
+        self.reused_count = 0
+
+    def record_result(self, key, source, result, reused=False):
+        """Keep the source and result of an item for the next incremental run"""
+        if not self.incremental:
+            return
+        self.current_sources[key] = source
+        self.current_results[key] = result
+        if reused:
+            self.reused_count += 1
+
+    def finish_incremental_run(self):
+        """Make this run's results the baseline of the next incremental run"""
+        if not self.incremental:
+            return
+        self.previous_sources = self.current_sources
+        self.previous_results = self.current_results
+        self.current_sources = {}
+        self.current_results = {}
+        if self.reused_count:
+            self.log_callback(f"Reused {self.reused_count} unchanged items from the previous run")
+
+    def translate_texts(self, texts):
+        """Translate standalone strings, keeping their order"""
+        results = list(texts)
+
+        def store(index, text, translated):
+            results[index] = translated
+
+        self.acquire_model()
+        try:
+            self.resolve_worker_settings()
+            self.run_pipeline(((i, text, text) for i, text in enumerate(results)), store, len(results), delay=0)
+        finally:
+            self.release_model()
+        return results
+
+    @abc.abstractmethod
+    def translate_document(self):
+        """Translate the source file and write the output file"""
+
+    @abc.abstractmethod
+    def iter_source_texts(self):
+        """Yield every source value a translation run would look at"""
+
+    def estimate_tokens(self, text):
+        """Roughly estimate model tokens (words and punctuation plus subword splits)"""
+        return math.ceil(len(self.TOKEN_PATTERN.findall(text)) * 1.3)
+
+    def estimate_cost(self):
+        """Estimate the work of a translation run without calling the model"""
+        started = time.perf_counter()
+
+        total_strings = 0
+        unique_segments = set()
+        for text in self.iter_source_texts():
+            total_strings += 1
+            if self.should_ignore(text):
+                continue
+            for part, needs_translation in self.iter_segments(text):
+                if needs_translation:
+                    unique_segments.add(part.strip())
+
+        report = {
+            'strings': total_strings,
+            'unique_segments': len(unique_segments),
+            'characters': 0,
+            'tokens': 0,
+            'cached_segments': 0,
+            'filtered_segments': 0,
+            'model_segments': 0,
+            'model_characters': 0,
+        }
+        for segment in unique_segments:
+            report['characters'] += len(segment)
+            report['tokens'] += self.estimate_tokens(segment)
+            if self.translation_memory.contains(segment):
+                report['cached_segments'] += 1
+            elif self.language_identifier and self.language_identifier.should_skip(
+                    segment, self.source_lang, self.target_lang):
+                report['filtered_segments'] += 1
+            else:
+                report['model_segments'] += 1
+                report['model_characters'] += len(segment)
+
+        report['cache_coverage'] = (report['cached_segments'] / len(unique_segments)) if unique_segments else 1.0
+
+        throughput = ThroughputLog.get(self.source_lang, self.target_lang)
+        if throughput:
+            report['chars_per_second'] = throughput['chars_per_second']
+            report['estimated_seconds'] = report['model_characters'] / throughput['chars_per_second']
+        else:
+            report['chars_per_second'] = None
+            report['estimated_seconds'] = None
+
+        report['elapsed_seconds'] = time.perf_counter() - started
+        return report
+
+    def log_cost_estimate(self, report):
+        """Log a dry-run report"""
+        self.log_callback(f"Dry run for {self.source_file} ({self.source_lang} -> {self.target_lang})")
+        self.log_callback(f"Strings: {report['strings']}, unique segments: {report['unique_segments']}")
+        self.log_callback(f"Characters: {report['characters']}, estimated tokens: {report['tokens']}")
+        self.log_callback(f"Cache coverage: {report['cache_coverage'] * 100:.1f}% "
+                          f"({report['cached_segments']} cached, {report['filtered_segments']} filtered, "
+                          f"{report['model_segments']} need the model)")
+        if report['estimated_seconds'] is not None:
+            self.log_callback(f"Estimated model time: {report['estimated_seconds'] / 60:.1f} min "
+                              f"at {report['chars_per_second']:.0f} chars/s measured on this machine")
+        else:
+            self.log_callback("Estimated model time: unknown (no throughput measured yet for this "
+                              "language pair; run one translation first)")
+        self.log_callback(f"Dry run took {report['elapsed_seconds']:.2f}s")
+
+    def record_throughput(self, seconds):
+        """Persist the model throughput of a finished run for future estimates"""
+        ThroughputLog.record(self.source_lang, self.target_lang, self.model_chars, self.model_calls, seconds)
+
+    def log_run_summary(self):
+        """Log cache and filter statistics after a run"""
+        self.log_callback(f"Cache: {self.translation_cache.describe()}")
+        memory = self.translation_memory
+        self.log_callback(f"Translation memory hits: {memory.exact_hits} exact, "
+                          f"{memory.template_hits} template, {memory.fuzzy_hits} fuzzy")
+        if self.language_identifier:
+            self.log_callback(f"Language filter skipped {self.language_skip_count} segments "
+                              f"({self.language_skip_count} model calls saved)")
+        if self.untranslated_count:
+            self.log_callback(f"Segments left untranslated (no model loaded): {self.untranslated_count}")
+
+
+class PropertiesTranslatorEngine(BaseTranslatorEngine):
+    """Translator engine for Properties files"""
+
+    UNICODE_ESCAPE_PATTERN = re.compile(r'(?<!\\)\\u([0-9a-fA-F]{4})')
+
+    # Sources from this size on are memory-mapped; their encodings must keep '\n', '#' and '=' single bytes
+    MMAP_THRESHOLD = 16 * 1024 * 1024
+    MMAP_ENCODINGS = ('utf-8', 'utf-8-sig', 'latin-1')
+    # Lines whose first non-blank character is not '#' and that contain an '='; line_value() decides the rest
+    CANDIDATE_LINE_PATTERN = re.compile(rb'^[^\S\n]*(?=[^#\s])[^\n]*=[^\n]*\n?', re.M)
+
+    @staticmethod
+    def line_key(line):
+        """Get the key of a properties line"""
+        return line.split('=', 1)[0].strip()
+
+    @staticmethod
+    def result_key(key, seen):
+        """Identify a line for incremental reuse by its key, numbering repeats so duplicate keys do not collide"""
+        count = seen[key] = seen.get(key, 0) + 1
+        return key if count == 1 else f"{key}#{count}"
+
+    @classmethod
+    def line_value(cls, line):
+        """Get the decoded value of a key=value line, or None for comments, blanks and empty values"""
+        line_stripped = line.strip()
+        if not line_stripped or line_stripped.startswith('#') or '=' not in line:
+            return None
+        value = line.split('=', 1)[1].strip()
+        return cls.decode_escapes(value) if value else None
+
+    @classmethod
+    def decode_escapes(cls, value):
+        """Decode Java \\uXXXX escapes so the model sees real characters"""
+        if '\\u' not in value:
+            return value
+        decoded = cls.UNICODE_ESCAPE_PATTERN.sub(lambda m: chr(int(m.group(1), 16)), value)
+        # Escaped surrogate pairs become a single character
+        return decoded.encode('utf-16', 'surrogatepass').decode('utf-16', 'surrogatepass')
+
+    @staticmethod
+    def encode_escapes(value):
+        """Escape non-ASCII characters as Java \\uXXXX sequences"""
+        if value.isascii():
+            return value
+        units = value.encode('utf-16-be', 'surrogatepass')
+        escaped = []
+        for i in range(0, len(units), 2):
+            code = (units[i] << 8) | units[i + 1]
+            escaped.append(chr(code) if code < 128 else f"\\u{code:04X}")
+        return ''.join(escaped)
+
+    def iter_source_texts(self):
+        """Yield the values of all key=value lines"""
+        done = 0
+        while True:
+            try:
+                with self.open_source() as f:
+                    for i, line in enumerate(f):
+                        if i < done:
+                            continue
+                        value = self.line_value(line)
+                        if value and self.key_allowed(self.line_key(line)):
+                            yield value
+                        done = i + 1
+                return
+            except UnicodeDecodeError:
+                # Lines already yielded are skipped when the file is read again as Latin-1
+                if not self.fall_back_encoding():
+                    raise
+
+    def count_source_lines(self):
+        """Count the lines of the source file without decoding them"""
+        try:
+            with open(self.source_file, 'rb') as f:
+                return sum(1 for _ in f)
+        except Exception as e:
+            raise Exception(f"Failed to read source file: {e}")
+
+    def iter_line_items(self, source):
+        """Stream (line_index, value, (result key, line)) pipeline items; untranslated lines have no value"""
+        seen = {}
+        for i, line in enumerate(source):
+            value = self.line_value(line)
+            key = self.line_key(line)
+            result_key = self.result_key(key, seen) if value else None
+            # Lines whose key and value did not change since the previous run keep their translation
+            if value and self.key_allowed(key) and self.reused_result(result_key, line) is None:
+                yield i, value, (result_key, line)
+            else:
+                yield i, None, (result_key, line)
+
+    def render_line(self, result_key, line, translated_value):
+        """Build the output line for a source line, or None to copy the source line unchanged"""
+        if not self.line_value(line):
+            return None
+
+        # Lines left out by the key-path rules are copied unchanged
+        if not self.key_allowed(self.line_key(line)):
+            return None
+        if translated_value is None:
+            new_line = self.reused_result(result_key, line)
+            self.record_result(result_key, line, new_line, reused=True)
+        else:
+            # Escaped sources stay escaped, and Latin-1 files can only hold escapes
+            if self.source_encoding == 'latin-1' or self.UNICODE_ESCAPE_PATTERN.search(line):
+                translated_value = self.encode_escapes(translated_value)
+            # Keep the source line ending, so CRLF files stay CRLF
+            ending = line[len(line.rstrip('\r\n')):]
+            new_line = f"{line.split('=', 1)[0].strip()}={translated_value}{ending}"
+            self.record_result(result_key, line, new_line)
+        return new_line
+
+    def use_memory_map(self):
+        """Check whether the source is large enough, and in a suitable encoding, to be memory-mapped"""
+        try:
+            size = os.path.getsize(self.source_file)
+        except OSError as e:
+            raise Exception(f"Failed to read source file: {e}")
+        return size >= self.MMAP_THRESHOLD and self.detect_source_encoding() in self.MMAP_ENCODINGS
+
+    def translate_lines(self):
+        """Translate the source as a decoded line stream"""
+        total_lines = self.count_source_lines()
+        self.log_callback(f"Total lines: {total_lines}")
+        self.log_callback(f"Processing with {self.max_workers} workers")
+
+        def write_line(line_index, context, translated_value):
+            result_key, line = context
+            new_line = self.render_line(result_key, line, translated_value)
+            output.write(line if new_line is None else new_line)
+
+        with self.open_source(newline='') as source, \
+                AtomicOutput(self.output_file, self.source_encoding, self.output_writer) as output:
+            completed = self.run_pipeline(self.iter_line_items(source), write_line, total_lines)
+            if not completed:
+                output.discard()
+            return completed
+
+    def translate_mapped(self):
+        """Translate a large source through a memory map, decoding only lines that may need translating"""
+        self.source_encoding = self.detect_source_encoding()
+        # Lines are decoded and encoded without the BOM, which is copied through with the first range
+        encoding = 'utf-8' if self.source_encoding == 'utf-8-sig' else self.source_encoding
+        bom_length = len(codecs.BOM_UTF8) if self.source_encoding == 'utf-8-sig' else 0
+
+        # Large outputs are streamed straight to disk rather than through the background writer
+        with open(self.source_file, 'rb') as source, \
+                mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) as mapped, \
+                AtomicOutput(self.output_file) as output, \
+                memoryview(mapped) as view:
+            total = sum(1 for _ in self.CANDIDATE_LINE_PATTERN.finditer(mapped))
+            self.log_callback(f"Memory-mapped {len(mapped) / (1024 * 1024):.1f} MB source, "
+                              f"{total} candidate lines")
+            self.log_callback(f"Processing with {self.max_workers} workers")
+
+            def iter_mapped_items():
+                seen = {}
+                for match in self.CANDIDATE_LINE_PATTERN.finditer(mapped):
+                    start = max(match.start(), bom_length)
+                    end = match.end()
+                    line = mapped[start:end].decode(encoding)
+                    value = self.line_value(line)
+                    key = self.line_key(line)
+                    result_key = self.result_key(key, seen) if value else None
+                    if value and self.key_allowed(key) and self.reused_result(result_key, line) is None:
+                        yield start, value, (start, end, result_key, line)
+                    else:
+                        yield start, None, (start, end, result_key, line)
+
+            position = 0
+
+            def write_mapped_line(offset, span, translated_value):
+                nonlocal position
+                start, end, result_key, line = span
+                # Everything between candidate lines is copied straight from the map
+                output.write(view[position:start])
+                new_line = self.render_line(result_key, line, translated_value)
+                if new_line is None:
+                    output.write(view[start:end])
+                else:
+                    output.write(new_line.encode(encoding))
+                position = end
+
+            completed = self.run_pipeline(iter_mapped_items(), write_mapped_line, total)
+            if completed:
+                output.write(view[position:])
+            else:
+                output.discard()
+            return completed
+
+    def translate_source(self):
+        if self.use_memory_map():
+            return self.translate_mapped()
+        return self.translate_lines()
+
+    def translate_document(self):
+        """Translate the properties file"""
+        self.log_callback(f"Reading properties file: {self.source_file}")
+        started = time.perf_counter()
+
+        self.start_incremental_run()
+
+        # Lines are written as they finish; the output only replaces the target when the run completes
+        try:
+            try:
+                completed = self.translate_source()
+            except UnicodeDecodeError:
+                # Only a prefix is sniffed; segments translated so far are reused from the translation memory
+                if not self.fall_back_encoding():
+                    raise
+                self.start_incremental_run()
+                completed = self.translate_source()
+        except Exception as e:
+            raise Exception(f"Failed to translate file: {e}")
+
+        if not completed:
+            self.log_callback("Translation stopped by user")
+            return
+
+        self.finish_incremental_run()
+        self.log_callback(f"Translation completed! Saved to: {self.output_file}")
+        self.log_run_summary()
+        self.record_throughput(time.perf_counter() - started)
+
+
+class YamlTranslatorEngine(BaseTranslatorEngine):
+    """Translator engine for YAML files"""
+
+    # A whole value that is one upper-case constant (STONE, ARROW, ENTITY_PLAYER_LEVELUP) is a config enum
+    ENUM_VALUE_PATTERN = re.compile(r'[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)*')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Configure YAML to preserve order and formatting; the libyaml classes parse several times faster
+        self.yaml_loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        self.yaml_dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
 
         # Add custom representer for better output formatting
         def represent_str(dumper, data):
@@ -954,21 +3783,69 @@ class YamlTranslatorEngine(BaseTranslatorEngine):
 
         self.yaml_dumper.add_representer(str, represent_str)
 
-    def extract_translatable_strings(self, data, path=""):
+    def load_source_data(self):
+        """Load the YAML source document"""
+        try:
+            try:
+                with self.open_source() as f:
+                    yaml_data = yaml.load(f, Loader=self.yaml_loader)
+            except UnicodeDecodeError:
+                # Only a prefix is sniffed, so a Latin-1 byte further in shows up here
+                if not self.fall_back_encoding():
+                    raise
+                with self.open_source() as f:
+                    yaml_data = yaml.load(f, Loader=self.yaml_loader)
+        except Exception as e:
+            raise Exception(f"Failed to read YAML file: {e}")
+
+        if yaml_data is None:
+            raise Exception("YAML file is empty or invalid")
+
+        return yaml_data
+
+    def iter_source_texts(self):
+        """Yield all translatable string values"""
+        for _, text in self.extract_translatable_strings(self.load_source_data()):
+            yield text
+
+    def extract_translatable_strings(self, data, path="", rule_state=None):
         """Extract translatable strings from YAML data structure"""
         translatable_items = []
+        rules = self.key_rules
+        if rules is not None and rule_state is None:
+            rule_state = rules.root()
+            if rule_state is None:
+                self.pruned_count += 1
+                return translatable_items
 
         if isinstance(data, dict):
             for key, value in data.items():
                 current_path = f"{path}.{key}" if path else key
-                translatable_items.extend(self.extract_translatable_strings(value, current_path))
+                child_state = None
+                if rules is not None:
+                    # Sections the key-path rules exclude are never walked
+                    child_state = rules.step(rule_state, ('key', str(key)))
+                    if child_state is None:
+                        self.pruned_count += 1
+                        continue
+                translatable_items.extend(self.extract_translatable_strings(value, current_path, child_state))
         elif isinstance(data, list):
             for i, item in enumerate(data):
                 current_path = f"{path}[{i}]"
-                translatable_items.extend(self.extract_translatable_strings(item, current_path))
+                child_state = None
+                if rules is not None:
+                    child_state = rules.step(rule_state, ('index', i))
+                    if child_state is None:
+                        self.pruned_count += 1
+                        continue
+                translatable_items.extend(self.extract_translatable_strings(item, current_path, child_state))
         elif isinstance(data, str):
-            # Only translate strings that aren't keys or technical values
-            if not self.should_ignore(data) and len(data.strip()) > 2:
+            if rules is not None and not rules.includes_state(rule_state):
+                self.pruned_count += 1
+                return translatable_items
+            # Only translate strings that aren't keys or technical values such as a material name
+            if (not self.should_ignore(data) and len(data.strip()) > 2 and
+                    not self.ENUM_VALUE_PATTERN.fullmatch(data.strip())):
                 translatable_items.append((path, data))
 
         return translatable_items
@@ -1018,105 +3895,1526 @@ class YamlTranslatorEngine(BaseTranslatorEngine):
         else:
             current_data[final_key] = value
 
-    def process_batch(self, strings_batch):
-        """Process a batch of translatable strings"""
-        if self.stop_translation:
-            return []
-
-        results = []
-        for path, original_text in strings_batch:
-            if self.stop_translation:
-                break
-
-            translated_text = self.translate_complex_text(original_text)
-            results.append((path, translated_text))
-
-        return results
-
-    def translate_file(self):
+    def translate_document(self):
         """Translate the YAML file"""
         self.log_callback(f"Reading YAML file: {self.source_file}")
+        started = time.perf_counter()
 
-        try:
-            with open(self.source_file, 'r', encoding='utf-8') as f:
-                yaml_data = yaml.load(f, Loader=self.yaml_loader)
-        except Exception as e:
-            raise Exception(f"Failed to read YAML file: {e}")
-
-        if yaml_data is None:
-            raise Exception("YAML file is empty or invalid")
+        yaml_data = self.load_source_data()
 
         # Extract translatable strings
+        self.pruned_count = 0
         translatable_strings = self.extract_translatable_strings(yaml_data)
         self.log_callback(f"Found {len(translatable_strings)} translatable strings")
+        if self.key_rules is not None:
+            self.log_callback(f"Key-path rules skipped {self.pruned_count} keys")
 
         if not translatable_strings:
             self.log_callback("No translatable strings found")
             return
 
-        # Create batches
-        batches = []
-        for i in range(0, len(translatable_strings), self.batch_size):
-            batch = translatable_strings[i:i + self.batch_size]
-            batches.append(batch)
+        self.log_callback(f"Processing with {self.max_workers} workers")
+        self.start_incremental_run()
 
-        self.log_callback(f"Processing {len(batches)} batches with {self.max_workers} workers")
+        def iter_string_items():
+            for path, text in translatable_strings:
+                # Strings unchanged since the previous run keep their translation
+                if self.reused_result(path, text) is None:
+                    yield path, text, text
+                else:
+                    yield path, None, text
 
-        # Process batches
-        translation_results = {}
-        processed_batches = 0
+        def apply_translation(path, text, translated_text):
+            if translated_text is None:
+                translated_text = self.reused_result(path, text)
+                self.record_result(path, text, translated_text, reused=True)
+            else:
+                self.record_result(path, text, translated_text)
+            try:
+                self.set_value_by_path(yaml_data, path, translated_text)
+            except Exception as e:
+                self.log_callback(f"Error setting value at path {path}: {e}")
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            if self.stop_translation:
-                return
+        if not self.run_pipeline(iter_string_items(), apply_translation, len(translatable_strings)):
+            self.log_callback("Translation stopped by user")
+            return
 
-            future_to_batch = {
-                executor.submit(self.process_batch, batch): i
-                for i, batch in enumerate(batches)
-            }
+        self.finish_incremental_run()
 
-            for future in as_completed(future_to_batch):
-                if self.stop_translation:
-                    break
+        # Save results
+        try:
+            with AtomicOutput(self.output_file, 'utf-8', self.output_writer) as f:
+                yaml.dump(yaml_data, f, Dumper=self.yaml_dumper, default_flow_style=False,
+                          allow_unicode=True, indent=2, sort_keys=False)
+            self.log_callback(f"Translation completed! Saved to: {self.output_file}")
+            self.log_run_summary()
+            self.record_throughput(time.perf_counter() - started)
+        except Exception as e:
+            raise Exception(f"Failed to save output file: {e}")
 
-                try:
-                    batch_results = future.result()
-                    for path, translated_text in batch_results:
-                        translation_results[path] = translated_text
 
-                    processed_batches += 1
-                    self.progress_callback(processed_batches, len(batches))
-                    self.log_callback(f"Processed batch {processed_batches}/{len(batches)}")
+class FileWatcher:
+    """Watch files and directories for changes with inotify, falling back to polling"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, paths, callback, debounce=0.3, poll_interval=0.5, log_callback=None, use_inotify=True):
+        self.files = {os.path.abspath(path) for path in paths if not os.path.isdir(path)}
+        self.directories = [os.path.abspath(path) for path in paths if os.path.isdir(path)]
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.log_callback = log_callback or print
+        self.use_inotify = use_inotify
+        self.stopped = threading.Event()
 
-                    time.sleep(self.delay_between_requests)
+        self.pending = set()
+        self.last_event = 0.0
 
-                except Exception as e:
-                    self.log_callback(f"Batch processing error: {e}")
+    def is_watched(self, path):
+        """Check if a changed path is one of the watched sources"""
+        if path in self.files:
+            return True
+        if os.path.splitext(path)[1].lower() not in TRANSLATABLE_EXTENSIONS:
+            return False
+        return any(path.startswith(directory + os.sep) for directory in self.directories)
+
+    def watched_directories(self):
+        """List the directories to register with inotify"""
+        # Parent directories are watched because editors often save by renaming a temp file
+        directories = {os.path.dirname(path) for path in self.files}
+        for directory in self.directories:
+            for root, _, _ in os.walk(directory):
+                directories.add(root)
+        return directories
+
+    def snapshot(self):
+        """Get (mtime, size) of every watched file for polling"""
+        paths = set(self.files)
+        for directory in self.directories:
+            for source, _ in collect_translatable_files(directory, directory):
+                paths.add(os.path.abspath(source))
+
+        state = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+                state[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                pass
+        return state
+
+    def add_pending(self, path):
+        if self.is_watched(path):
+            self.pending.add(path)
+            self.last_event = time.monotonic()
+
+    def flush_pending(self):
+        """Report pending changes once no new event arrived for the debounce interval"""
+        if self.pending and time.monotonic() - self.last_event >= self.debounce:
+            changed = sorted(self.pending)
+            self.pending.clear()
+            try:
+                self.callback(changed)
+            except Exception as e:
+                self.log_callback(f"Watch callback error: {e}")
 
-        if self.stop_translation:
-            self.log_callback("Translation stopped by user")
+    def open_inotify(self):
+        """Create an inotify instance, or return None where it is unavailable"""
+        if not self.use_inotify or not sys.platform.startswith('linux'):
+            return None, None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if fd < 0:
+                return None, None
+            return libc, fd
+        except Exception:
+            return None, None
+
+    def add_inotify_watch(self, libc, fd, directory, watches):
+        wd = libc.inotify_add_watch(fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd >= 0:
+            watches[wd] = directory
+
+    def run(self):
+        """Watch until stop() is called"""
+        libc, fd = self.open_inotify()
+        if fd is None:
+            self.log_callback(f"Watching with polling every {self.poll_interval}s")
+            self.run_polling()
             return
 
-        # Apply translations to the YAML data
-        for path, translated_text in translation_results.items():
-            try:
-                self.set_value_by_path(yaml_data, path, translated_text)
-            except Exception as e:
-                self.log_callback(f"Error setting value at path {path}: {e}")
+        self.log_callback("Watching with inotify")
+        watches = {}
+        try:
+            for directory in self.watched_directories():
+                self.add_inotify_watch(libc, fd, directory, watches)
+
+            while not self.stopped.is_set():
+                timeout = self.debounce if self.pending else 0.5
+                readable, _, _ = select.select([fd], [], [], timeout)
+                if readable:
+                    self.read_inotify_events(libc, fd, watches)
+                self.flush_pending()
+        finally:
+            os.close(fd)
 
-        # Save results
+    def read_inotify_events(self, libc, fd, watches):
         try:
-            os.makedirs(os.path.dirname(self.output_file), exist_ok=True)
-            with open(self.output_file, 'w', encoding='utf-8') as f:
-                yaml.dump(yaml_data, f, Dumper=self.yaml_dumper, default_flow_style=False,
-                          allow_unicode=True, indent=2, sort_keys=False)
-            self.log_callback(f"Translation completed! Saved to: {self.output_file}")
-            self.log_callback(f"Cache entries: {len(self.translation_cache)}")
+            data = os.read(fd, 64 * 1024)
+        except BlockingIOError:
+            return
+
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, name_length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b'\0'))
+            offset += name_length
+
+            directory = watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & self.IN_ISDIR:
+                # New subdirectories of a watched directory are watched as well
+                if mask & self.IN_CREATE and any(path.startswith(d + os.sep) for d in self.directories):
+                    self.add_inotify_watch(libc, fd, path, watches)
+                continue
+            self.add_pending(path)
+
+    def run_polling(self):
+        state = self.snapshot()
+        while not self.stopped.wait(self.poll_interval if not self.pending else self.debounce):
+            current = self.snapshot()
+            for path, signature in current.items():
+                if state.get(path) != signature:
+                    self.add_pending(path)
+            state = current
+            self.flush_pending()
+
+    def stop(self):
+        self.stopped.set()
+
+
+class WatchSession:
+    """Keeps one warm engine per watched file and re-translates only changed keys on save"""
+
+    def __init__(self, sources, output, engine_kwargs, file_type='auto', debounce=0.3, log_callback=None,
+                 use_inotify=True):
+        self.engine_kwargs = dict(engine_kwargs)
+        self.engine_kwargs.setdefault('delay_between_requests', 0)
+        self.file_type = file_type
+        self.log_callback = log_callback or print
+        self.engines = {}
+
+        # Explicit file -> output mappings and directory roots for files created later
+        self.file_outputs = {}
+        self.directory_outputs = []
+        single_file = len(sources) == 1 and not os.path.isdir(sources[0])
+        for source in sources:
+            source = os.path.abspath(source)
+            if os.path.isdir(source):
+                target = os.path.join(output, os.path.basename(source)) if len(sources) > 1 else output
+                self.directory_outputs.append((source, os.path.abspath(target)))
+            elif single_file and os.path.splitext(output)[1]:
+                self.file_outputs[source] = os.path.abspath(output)
+            else:
+                self.file_outputs[source] = os.path.abspath(os.path.join(output, os.path.basename(source)))
+
+        self.watcher = FileWatcher(sources, self.on_change, debounce=debounce, log_callback=self.log_callback,
+                                   use_inotify=use_inotify)
+
+    def output_for(self, source):
+        """Get the output path for a source file, or None if it is not watched"""
+        if source in self.file_outputs:
+            return self.file_outputs[source]
+        for source_root, output_root in self.directory_outputs:
+            if source.startswith(source_root + os.sep):
+                return os.path.join(output_root, os.path.relpath(source, source_root))
+        return None
+
+    def all_sources(self):
+        sources = list(self.file_outputs)
+        for source_root, _ in self.directory_outputs:
+            sources.extend(os.path.abspath(source) for source, _ in collect_translatable_files(source_root, source_root))
+        return sources
+
+    def translate(self, source):
+        """Translate one source file, reusing its engine and previous results"""
+        output = self.output_for(source)
+        if output is None or not os.path.exists(source):
+            return
+
+        started = time.perf_counter()
+        engine = self.engines.get(source)
+        if engine is None:
+            file_type = self.file_type if self.file_type != 'auto' else detect_file_type(source)
+            engine = create_translator_engine(file_type, source_file=source, output_file=output,
+                                              log_callback=lambda message: None, incremental=True,
+                                              **self.engine_kwargs)
+            self.engines[source] = engine
+
+        try:
+            engine.translate_file_with_profiler()
+            self.log_callback(f"Translated {source} -> {output} in {time.perf_counter() - started:.2f}s")
         except Exception as e:
-            raise Exception(f"Failed to save output file: {e}")
+            self.log_callback(f"Failed to translate {source}: {e}")
+
+    def on_change(self, paths):
+        for path in paths:
+            self.translate(path)
+
+    def run(self):
+        """Translate everything once, then keep watching"""
+        for source in self.all_sources():
+            self.translate(source)
+        self.watcher.run()
+
+    def stop(self):
+        self.watcher.stop()
+
+
+class ShardPlan:
+    """Deduplicated segments of a large job split into shard files that any node can translate"""
+
+    PLAN_FILE = 'plan.json'
+    VERSION = 1
+
+    def __init__(self, plan_dir, data):
+        self.plan_dir = plan_dir
+        self.data = data
+
+    @classmethod
+    def load(cls, plan_dir):
+        """Load a plan created by create()"""
+        try:
+            with open(os.path.join(plan_dir, cls.PLAN_FILE), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            raise Exception(f"Failed to read shard plan in {plan_dir}: {e}")
+        if data.get('version') != cls.VERSION:
+            raise Exception(f"Unsupported shard plan version {data.get('version')}")
+        return cls(plan_dir, data)
+
+    @staticmethod
+    def collect_inputs(inputs):
+        """Expand input files and directories into (source, relative output path) pairs"""
+        pairs = []
+        for path in inputs:
+            if os.path.isdir(path):
+                prefix = os.path.basename(os.path.abspath(path)) if len(inputs) > 1 else ''
+                for source, relative in collect_translatable_files(path, prefix):
+                    pairs.append((os.path.abspath(source), relative))
+            else:
+                pairs.append((os.path.abspath(path), os.path.basename(path)))
+        return pairs
+
+    @classmethod
+    def create(cls, inputs, plan_dir, output_dir, source_lang, target_langs, shard_count,
+               file_type='auto', engine_options=None, log_callback=None):
+        """Extract and deduplicate all segments of the inputs and write them into shard files"""
+        log_callback = log_callback or print
+        engine_options = engine_options or {}
+        os.makedirs(plan_dir, exist_ok=True)
+
+        files = []
+        segments = {}  # Insertion-ordered set of unique segments
+        for source, relative in cls.collect_inputs(inputs):
+            source_type = file_type if file_type != 'auto' else detect_file_type(source)
+            engine = create_translator_engine(source_type, source_file=source, output_file=None,
+                                              source_lang=source_lang, target_lang=target_langs[0],
+                                              dry_run=True, log_callback=log_callback, **engine_options)
+            for text in engine.iter_source_texts():
+                if engine.should_ignore(text):
+                    continue
+                for part, needs_translation in engine.iter_segments(text):
+                    if needs_translation:
+                        segments.setdefault(part.strip(), None)
+            files.append({'source': source, 'output': relative, 'file_type': source_type})
+
+        # Greedy balancing by character count so shards take similar time
+        shard_count = max(1, min(shard_count, len(segments) or 1))
+        shards = [[] for _ in range(shard_count)]
+        heap = [(0, index) for index in range(shard_count)]
+        for segment in sorted(segments, key=len, reverse=True):
+            size, index = heapq.heappop(heap)
+            shards[index].append(segment)
+            heapq.heappush(heap, (size + len(segment), index))
+
+        shard_files = []
+        for index, shard in enumerate(shards):
+            name = f"shard-{index:04d}.jsonl"
+            with open(os.path.join(plan_dir, name), 'w', encoding='utf-8') as f:
+                for segment in shard:
+                    f.write(json.dumps({'text': segment}, ensure_ascii=False) + '\n')
+            shard_files.append(name)
+
+        data = {
+            'version': cls.VERSION,
+            'source_lang': source_lang,
+            'target_langs': list(target_langs),
+            'output_dir': os.path.abspath(output_dir),
+            'files': files,
+            'shards': shard_files,
+            'segments': len(segments),
+            'engine_options': engine_options,
+        }
+        with open(os.path.join(plan_dir, cls.PLAN_FILE), 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+        log_callback(f"Planned {len(segments)} unique segments from {len(files)} files "
+                     f"into {len(shard_files)} shards for {', '.join(target_langs)}")
+        return cls(plan_dir, data)
+
+    def result_path(self, shard_index, target_lang):
+        return os.path.join(self.plan_dir, 'results', f"shard-{shard_index:04d}.{target_lang}.jsonl")
+
+    def translate_shard(self, shard_index, target_lang, engine_kwargs=None, log_callback=None):
+        """Translate one shard for one target language and write its result file"""
+        log_callback = log_callback or print
+        result_path = self.result_path(shard_index, target_lang)
+        if os.path.exists(result_path):
+            log_callback(f"Shard {shard_index} ({target_lang}) already translated, skipping")
+            return result_path
+
+        with open(os.path.join(self.plan_dir, self.data['shards'][shard_index]), 'r', encoding='utf-8') as f:
+            segments = [json.loads(line)['text'] for line in f if line.strip()]
+
+        started = time.perf_counter()
+        engine = create_translator_engine('properties', source_file=None, output_file=None,
+                                          source_lang=self.data['source_lang'], target_lang=target_lang,
+                                          log_callback=log_callback, **(engine_kwargs or {}))
+        translations = engine.translate_texts(segments)
+        if engine.stop_translation:
+            raise Exception("Shard translation was stopped")
+
+        # Written under a temporary name so an interrupted shard is never merged
+        os.makedirs(os.path.dirname(result_path), exist_ok=True)
+        temp_path = result_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for segment, translation in zip(segments, translations):
+                f.write(json.dumps({'text': segment, 'translation': translation}, ensure_ascii=False) + '\n')
+        os.replace(temp_path, result_path)
+
+        log_callback(f"Translated shard {shard_index} ({target_lang}): {len(segments)} segments "
+                     f"in {time.perf_counter() - started:.1f}s")
+        return result_path
+
+    def run_local(self, target_langs, processes, extra_args=(), log_callback=None):
+        """Translate every shard in separate local processes, as separate nodes would"""
+        log_callback = log_callback or print
+        jobs = [(index, lang) for lang in target_langs for index in range(len(self.data['shards']))
+                if not os.path.exists(self.result_path(index, lang))]
+        log_callback(f"Running {len(jobs)} shard jobs with {processes} local processes")
+
+        running = []
+        failures = 0
+        while jobs or running:
+            while jobs and len(running) < processes:
+                index, lang = jobs.pop(0)
+                command = [sys.executable, os.path.abspath(__file__), 'shard', self.plan_dir,
+                           '--shard', str(index), '--to', lang] + list(extra_args)
+                running.append((index, lang, subprocess.Popen(command)))
+
+            time.sleep(0.2)
+            for job in list(running):
+                index, lang, process = job
+                if process.poll() is not None:
+                    running.remove(job)
+                    if process.returncode != 0:
+                        failures += 1
+                        log_callback(f"Shard {index} ({lang}) failed with exit code {process.returncode}")
+        return failures
+
+    def merge(self, log_callback=None):
+        """Load all shard results into the translation memory and write every output"""
+        log_callback = log_callback or print
+        writer = OutputWriter(log_callback)
+        try:
+            self.merge_languages(writer, log_callback)
+        finally:
+            writer.close()
+
+    def merge_languages(self, writer, log_callback):
+        """Merge the shard results and write the outputs of each target language in turn"""
+
+        for lang in self.data['target_langs']:
+            missing = [index for index in range(len(self.data['shards']))
+                       if not os.path.exists(self.result_path(index, lang))]
+            if missing:
+                raise Exception(f"Missing results for {lang} shards: {', '.join(map(str, missing))}")
+
+            # A private unbounded memory, so no shard result can be evicted before it is written
+            memory = TranslationMemory(fuzzy_threshold=self.data['engine_options'].get('fuzzy_threshold', 0.0))
+            loaded = 0
+            for index in range(len(self.data['shards'])):
+                with open(self.result_path(index, lang), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            memory.remember(record['text'], record['translation'])
+                            loaded += 1
+            log_callback(f"Loaded {loaded} translated segments for {lang}")
+
+            for entry in self.data['files']:
+                output = os.path.join(self.data['output_dir'], lang, entry['output'])
+                engine = create_translator_engine(
+                    entry['file_type'], source_file=entry['source'], output_file=output,
+                    source_lang=self.data['source_lang'], target_lang=lang, dry_run=True,
+                    delay_between_requests=0, log_callback=lambda message: None, output_writer=writer,
+                    **self.data['engine_options'])
+                engine.translation_memory = memory
+                engine.translate_file()
+                if engine.untranslated_count:
+                    log_callback(f"{output}: {engine.untranslated_count} segments had no shard translation")
+            log_callback(f"Wrote {len(self.data['files'])} files for {lang}")
+
+
+DEFAULT_DAEMON_ADDRESS = "127.0.0.1:8765"
+DAEMON_TOKEN_HEADER = 'X-Daemon-Token'
+LOOPBACK_HOSTS = ('localhost', '127.0.0.1', '::1')
+
+# Engine options a daemon client may set per request
+DAEMON_ENGINE_OPTIONS = ('batch_size', 'delay_between_requests', 'skip_target_language', 'glossary_file',
+                         'fuzzy_threshold', 'performance_profile', 'key_rules')
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler for the translation daemon"""
+
+    server_version = "MinecraftTranslatorDaemon/1.0"
+
+    def log_message(self, format, *args):
+        # client_address is empty on Unix sockets, so the default formatter cannot be used
+        self.server.translation_daemon.log(f"{self.command} {self.path}: {format % args}")
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def check_request(self):
+        """Send an error and return False unless the request comes from a local client holding the token"""
+        daemon = self.server.translation_daemon
+        # A page in a browser cannot fake Host or Origin, which stops DNS rebinding and cross-site posts
+        if not daemon.unix_socket and url_host(self.headers.get('Host', '')) not in LOOPBACK_HOSTS:
+            self.send_json(403, {'error': "Only local clients may use the daemon"})
+            return False
+        origin = self.headers.get('Origin')
+        if origin and url_host(urllib.parse.urlsplit(origin).netloc) not in LOOPBACK_HOSTS:
+            self.send_json(403, {'error': f"Requests from {origin} are not allowed"})
+            return False
+        if not hmac.compare_digest(self.headers.get(DAEMON_TOKEN_HEADER, ''), daemon.token):
+            self.send_json(401, {'error': f"Missing or wrong daemon token (see {daemon.token_file})"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self.check_request():
+            return
+        if self.path == '/status':
+            self.send_json(200, self.server.translation_daemon.handle_status())
+        else:
+            self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        daemon = self.server.translation_daemon
+        routes = {
+            '/translate': daemon.handle_translate,
+            '/translate-file': daemon.handle_translate_file,
+        }
+        handler = routes.get(self.path)
+        if handler is None:
+            self.send_json(404, {'error': f"Unknown endpoint {self.path}"})
+            return
+        if not self.check_request():
+            return
+        # Plain form and text posts are what a browser can send without asking, so only JSON is accepted
+        if self.headers.get_content_type() != 'application/json':
+            self.send_json(415, {'error': "Content-Type must be application/json"})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            self.send_json(200, handler(payload))
+        except PermissionError as e:
+            self.send_json(403, {'error': str(e)})
+        except Exception as e:
+            self.send_json(500, {'error': str(e)})
+
+
+class TranslationDaemon:
+    """Long-lived local server keeping models, translation memory and workers warm"""
+
+    def __init__(self, address=DEFAULT_DAEMON_ADDRESS, max_workers=2, log_callback=None, default_options=None,
+                 allowed_roots=None):
+        self.address = address
+        self.max_workers = max_workers
+        self.log_callback = log_callback or print
+        self.default_options = default_options or {}
+        self.unix_socket = address.startswith('unix:')
+        # Over TCP, files may only be read and written below these directories
+        self.allowed_roots = [os.path.realpath(root) for root in (allowed_roots or [os.getcwd()])]
+        self.token = secrets.token_urlsafe(32)
+        self.token_file = daemon_token_path(address)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.started_at = time.time()
+        self.jobs_served = 0
+        self.server = None
+
+    def log(self, message):
+        timestamp = time.strftime("%H:%M:%S")
+        self.log_callback(f"[{timestamp}] {message}")
+
+    def check_path(self, path):
+        """Resolve a client path, refusing paths outside the allowed roots on TCP"""
+        path = os.path.realpath(path)
+        # Only this user can connect to the Unix socket, so its paths are not limited
+        if self.unix_socket:
+            return path
+        for root in self.allowed_roots:
+            if os.path.commonpath([path, root]) == root:
+                return path
+        raise PermissionError(f"{path} is outside the daemon's allowed roots ({', '.join(self.allowed_roots)}); "
+                              f"start the daemon with --root to allow it")
+
+    def create_engine(self, payload, file_type='properties', source_file=None, output_file=None,
+                      log_callback=None):
+        """Create a short-lived engine on top of the warm registry, cache and worker pool"""
+        options = dict(self.default_options)
+        options.update({key: value for key, value in payload.get('options', {}).items()
+                        if key in DAEMON_ENGINE_OPTIONS})
+        if payload.get('options', {}).get('glossary_file'):
+            options['glossary_file'] = self.check_path(options['glossary_file'])
+        source_lang = payload.get('source_lang', 'en')
+        target_lang = payload.get('target_lang', 'id')
+        # 'auto' batch size is just the default dispatch grain, so no request calibrates inside the daemon
+        if options.get('batch_size', WorkerTuning.AUTO) == WorkerTuning.AUTO:
+            options['batch_size'] = WorkerTuning.DEFAULT_BATCH_SIZE
+        options.setdefault('delay_between_requests', 0)
+
+        return create_translator_engine(
+            file_type,
+            source_file=source_file,
+            output_file=output_file,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            max_workers=self.max_workers,
+            log_callback=log_callback or self.log,
+            executor=self.executor,
+            **options
+        )
+
+    def preload(self, source_lang, target_lang):
+        """Load a language pair before the first request arrives"""
+        engine = self.create_engine({'source_lang': source_lang, 'target_lang': target_lang})
+        # Argos loads the model lazily, so force it with a tiny translation
+        engine.translation_engine.translate("Hello")
+        self.log(f"Preloaded {source_lang}->{target_lang}")
+
+    def handle_status(self):
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self.started_at, 1),
+            'jobs_served': self.jobs_served,
+            'workers': self.max_workers,
+            'models': ModelRegistry.shared().loaded_pairs(),
+            'memory': ModelRegistry.shared().describe_memory(),
+            'cache': TranslationCache.shared().describe(),
+        }
+
+    def handle_translate(self, payload):
+        texts = payload.get('texts')
+        if not isinstance(texts, list):
+            raise Exception("'texts' must be a list of strings")
+
+        engine = self.create_engine(payload, log_callback=lambda message: None)
+        translations = engine.translate_texts(texts)
+        self.jobs_served += 1
+        return {'translations': translations}
+
+    def handle_translate_file(self, payload):
+        source_file = payload.get('source_file')
+        output_file = payload.get('output_file')
+        if not source_file or not output_file:
+            raise Exception("'source_file' and 'output_file' are required")
+        source_file = self.check_path(source_file)
+        output_file = self.check_path(output_file)
+        if not os.path.exists(source_file):
+            raise Exception(f"Source file does not exist: {source_file}")
+
+        file_type = payload.get('file_type') or 'auto'
+        if file_type == 'auto':
+            file_type = detect_file_type(source_file)
+
+        messages = []
+        engine = self.create_engine(payload, file_type=file_type, source_file=source_file,
+                                    output_file=output_file, log_callback=messages.append)
+        engine.translate_file()
+        self.jobs_served += 1
+        return {'output_file': output_file, 'log': messages}
+
+    def create_server(self):
+        """Create an HTTP server on localhost TCP or, with a 'unix:' address, a Unix socket"""
+        if self.address.startswith('unix:'):
+            if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+                raise Exception("Unix sockets are not supported on this platform")
+            socket_path = self.address[len('unix:'):]
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            server = socketserver.ThreadingUnixStreamServer(socket_path, DaemonRequestHandler)
+            server.daemon_threads = True
+            os.chmod(socket_path, 0o600)
+        else:
+            host, port = parse_daemon_address(self.address)
+            server = ThreadingHTTPServer((host, port), DaemonRequestHandler)
+        server.translation_daemon = self
+        return server
+
+    def serve_forever(self):
+        """Serve requests until interrupted"""
+        self.server = self.create_server()
+        self.write_token()
+        self.log(f"Translation daemon listening on {self.address} with {self.max_workers} workers")
+        try:
+            self.server.serve_forever()
+        finally:
+            if os.path.exists(self.token_file):
+                os.unlink(self.token_file)
+            self.server.server_close()
+            self.executor.shutdown(wait=False)
+            if self.address.startswith('unix:') and os.path.exists(self.address[len('unix:'):]):
+                os.unlink(self.address[len('unix:'):])
+
+    def write_token(self):
+        """Write the access token to a file only this user can read"""
+        descriptor = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            f.write(self.token)
+        # An existing file keeps its mode, so tighten it explicitly
+        os.chmod(self.token_file, 0o600)
+
+    def shutdown(self):
+        """Stop serving (call from another thread)"""
+        if self.server:
+            self.server.shutdown()
+
+
+def url_host(netloc):
+    """Host name of a Host header or URL authority, without port or brackets"""
+    return (urllib.parse.urlsplit(f"//{netloc}").hostname or '').lower()
+
+
+def daemon_token_path(address):
+    """Token file of the daemon on an address, shared by the daemon and its clients"""
+    if address.startswith('unix:'):
+        name = hashlib.sha1(os.path.realpath(address[len('unix:'):]).encode('utf-8')).hexdigest()[:16]
+    else:
+        # Clients may write localhost or 127.0.0.1, so only the port names the daemon
+        name = parse_daemon_address(address)[1]
+    return os.path.join(get_app_data_dir(), f"daemon-{name}.token")
+
+
+def parse_daemon_address(address):
+    """Split a 'host:port' (optionally http://) daemon address"""
+    address = address.replace('http://', '').rstrip('/')
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket"""
+
+    def __init__(self, socket_path, timeout=None):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class DaemonClient:
+    """Thin client for a running translation daemon"""
+
+    def __init__(self, address=DEFAULT_DAEMON_ADDRESS, timeout=None):
+        self.address = address
+        self.timeout = timeout
+
+    def create_connection(self):
+        if self.address.startswith('unix:'):
+            return UnixHTTPConnection(self.address[len('unix:'):], timeout=self.timeout)
+        host, port = parse_daemon_address(self.address)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def request(self, method, path, payload=None):
+        connection = self.create_connection()
+        try:
+            body = json.dumps(payload).encode('utf-8') if payload is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            headers[DAEMON_TOKEN_HEADER] = self.read_token()
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = json.loads(response.read() or b'{}')
+        except (ConnectionError, OSError) as e:
+            raise Exception(f"Could not reach translation daemon at {self.address}: {e}")
+        finally:
+            connection.close()
+
+        if response.status != 200:
+            raise Exception(f"Daemon error: {data.get('error', response.reason)}")
+        return data
+
+    def read_token(self):
+        """Read the token the daemon wrote when it started"""
+        try:
+            with open(daemon_token_path(self.address), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            raise Exception(f"No token for the translation daemon at {self.address}; "
+                            f"is it running as this user?")
+
+    def status(self):
+        return self.request('GET', '/status')
+
+    def translate_texts(self, texts, source_lang, target_lang, **options):
+        payload = {'source_lang': source_lang, 'target_lang': target_lang, 'texts': list(texts),
+                   'options': options}
+        return self.request('POST', '/translate', payload)['translations']
+
+    def translate_file(self, source_file, output_file, source_lang, target_lang, file_type='auto', **options):
+        payload = {
+            # The daemon may run in another working directory
+            'source_file': os.path.abspath(source_file),
+            'output_file': os.path.abspath(output_file),
+            'source_lang': source_lang,
+            'target_lang': target_lang,
+            'file_type': file_type,
+            'options': options,
+        }
+        return self.request('POST', '/translate-file', payload)
+
+
+def create_translator_engine(file_type, **kwargs):
+    """Create the translator engine for a file type"""
+    engine_class = YamlTranslatorEngine if file_type == 'yaml' else PropertiesTranslatorEngine
+    return engine_class(**kwargs)
+
+
+def build_arg_parser():
+    """Build the command line interface"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Minecraft Properties & YAML File Translator (run without arguments for the GUI)"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    translate_parser = subparsers.add_parser("translate", help="Translate a properties or YAML file or directory")
+    translate_parser.add_argument("source", help="Source file or directory")
+    translate_parser.add_argument("output", nargs="?",
+                                  help="Output file or directory (default: <source>_translated<ext>)")
+    add_engine_arguments(translate_parser)
+    translate_parser.add_argument("--dry-run", action="store_true",
+                                  help="Only estimate segments, tokens, cache coverage and time; never calls the model")
+    translate_parser.add_argument("--daemon", metavar="ADDRESS",
+                                  help="Send the job to a running daemon (host:port or unix:/path)")
+
+    watch_parser = subparsers.add_parser("watch", help="Re-translate files automatically when they are saved")
+    watch_parser.add_argument("sources", nargs="+", help="Source files or directories to watch")
+    watch_parser.add_argument("-o", "--output", required=True,
+                              help="Output file (single source file) or output directory")
+    watch_parser.add_argument("--debounce", type=float, default=0.3,
+                              help="Seconds of quiet after a save before translating (default: 0.3)")
+    watch_parser.add_argument("--poll", action="store_true", help="Use polling instead of inotify")
+    add_engine_arguments(watch_parser)
+    watch_parser.set_defaults(delay=0)
+
+    plan_parser = subparsers.add_parser("plan", help="Extract and deduplicate segments into shard files")
+    plan_parser.add_argument("inputs", nargs="+", help="Source files or directories")
+    plan_parser.add_argument("--plan-dir", required=True, help="Directory for the plan and shard files")
+    plan_parser.add_argument("-o", "--output", required=True,
+                             help="Output directory; merge writes <output>/<lang>/<file>")
+    plan_parser.add_argument("--from", dest="source_lang", default="en", help="Source language code")
+    plan_parser.add_argument("--to", dest="target_langs", default="id",
+                             help="Comma-separated target language codes (default: id)")
+    plan_parser.add_argument("--shards", type=int, default=8, help="Number of shards (default: 8)")
+    plan_parser.add_argument("--type", dest="file_type", choices=["auto", "properties", "yaml"], default="auto",
+                             help="File type (default: auto-detect)")
+    plan_parser.add_argument("--glossary", help="Glossary term file")
+    plan_parser.add_argument("--keys", help="Key-path rules, as for translate")
+
+    shard_parser = subparsers.add_parser("shard", help="Translate shards of a plan with the local model")
+    shard_parser.add_argument("plan_dir", help="Plan directory")
+    shard_group = shard_parser.add_mutually_exclusive_group(required=True)
+    shard_group.add_argument("--shard", type=int, help="Shard index to translate")
+    shard_group.add_argument("--all", action="store_true", help="Translate all shards in local processes")
+    shard_parser.add_argument("--to", dest="target_langs", help="Comma-separated target languages (default: all)")
+    shard_parser.add_argument("--processes", type=int, default=2, help="Local processes for --all (default: 2)")
+    shard_parser.add_argument("--threads", type=int, default=2, help="Worker threads per process (default: 2)")
+    shard_parser.add_argument("--batch-size", type=int, default=5, help="Strings per batch (default: 5)")
+    shard_parser.add_argument("--memory-budget-mb", type=int,
+                              help="Memory budget for models and workers, split across --all processes")
+    add_profile_arguments(shard_parser)
+
+    merge_parser = subparsers.add_parser("merge", help="Merge shard results and write all outputs")
+    merge_parser.add_argument("plan_dir", help="Plan directory")
+
+    daemon_parser = subparsers.add_parser("daemon", help="Run a local translation daemon that keeps models warm")
+    daemon_parser.add_argument("--address", default=DEFAULT_DAEMON_ADDRESS,
+                               help=f"host:port or unix:/path/to.sock (default: {DEFAULT_DAEMON_ADDRESS})")
+    daemon_parser.add_argument("--threads", type=int, default=2, help="Worker threads (default: 2)")
+    daemon_parser.add_argument("--preload", default="",
+                               help="Comma-separated language pairs to load at startup, e.g. en:id,en:es")
+    daemon_parser.add_argument("--cache-limit-mb", type=int, help="Translation cache size limit in MB")
+    daemon_parser.add_argument("--memory-budget-mb", type=int,
+                               help="Memory budget for models and workers; idle language pairs are unloaded to fit")
+    daemon_parser.add_argument("--glossary", help="Default glossary term file")
+    daemon_parser.add_argument("--keys", help="Default key-path rules")
+    daemon_parser.add_argument("--root", action="append",
+                               help="Directory clients may read and write files in over TCP; repeatable "
+                                    "(default: the current directory)")
+    add_profile_arguments(daemon_parser)
+
+    benchmark_parser = subparsers.add_parser("benchmark", help="Compare runtime profiles on a sample of a file")
+    benchmark_parser.add_argument("source", help="Properties or YAML file to sample segments from")
+    benchmark_parser.add_argument("--profiles", default=",".join(PerformanceProfile.PRESETS.keys()),
+                                  help="Comma-separated profiles to compare (default: all)")
+    benchmark_parser.add_argument("--samples", type=int, default=200, help="Number of segments (default: 200)")
+    benchmark_parser.add_argument("--from", dest="source_lang", default="en", help="Source language code")
+    benchmark_parser.add_argument("--to", dest="target_lang", default="id", help="Target language code")
+    benchmark_parser.add_argument("--type", dest="file_type", choices=["auto", "properties", "yaml"], default="auto",
+                                  help="File type (default: auto-detect)")
+
+    memory_parser = subparsers.add_parser("benchmark-memory",
+                                          help="Measure pipeline peak memory on a synthetic corpus")
+    memory_parser.add_argument("--segments", type=int, default=1000000,
+                               help="Number of segments in the corpus (default: 1000000)")
+
+    regress_parser = subparsers.add_parser("regress",
+                                           help="Check outputs against golden files with a stub translator "
+                                                "and record speed and memory")
+    regress_parser.add_argument("--dir", dest="directory", default=REGRESSION_DIR,
+                                help="Directory with fixtures/, golden/ and glossary.txt (default: ./regression)")
+    regress_parser.add_argument("--update", action="store_true", help="Rewrite the golden outputs")
+    regress_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per fixture (default: 5)")
+    regress_parser.add_argument("--report", help="Save the measurements to a JSON file")
+    regress_parser.add_argument("--baseline", help="Fail on fixtures slower or larger than in this saved report")
+    regress_parser.add_argument("--tolerance", type=float, default=0.25,
+                                help="Allowed slowdown/memory growth against the baseline (default: 0.25)")
+
+    return parser
+
+
+def add_engine_arguments(parser):
+    """Add the options shared by every command that creates an engine"""
+    parser.add_argument("--from", dest="source_lang", default="en", help="Source language code (default: en)")
+    parser.add_argument("--to", dest="target_lang", default="id", help="Target language code (default: id)")
+    parser.add_argument("--type", dest="file_type", choices=["auto", "properties", "yaml"], default="auto",
+                        help="File type (default: auto-detect)")
+    parser.add_argument("--threads", type=worker_setting, default=WorkerTuning.AUTO,
+                        help="Worker threads, or 'auto' for the calibrated count (default: auto)")
+    parser.add_argument("--batch-size", type=worker_setting, default=WorkerTuning.AUTO,
+                        help="Strings per batch, or 'auto' for the calibrated size (default: auto)")
+    parser.add_argument("--delay", type=float, default=0.3, help="Delay between batches in seconds (default: 0.3)")
+    parser.add_argument("--glossary", help="Glossary term file")
+    parser.add_argument("--keys", help="Key-path rules, e.g. 'messages.**,**.lore[*],!database.*', "
+                                       f"or built-in profiles ({', '.join('@' + name for name in KeyPathRules.PROFILES)})")
+    parser.add_argument("--fuzzy", type=float, default=0.0,
+                        help="Fuzzy translation memory threshold between 0 and 1 (default: 0, disabled)")
+    parser.add_argument("--cache-limit-mb", type=int, help="Translation cache size limit in MB")
+    parser.add_argument("--memory-budget-mb", type=int,
+                        help="Memory budget for models and workers; fewer workers are used to fit it")
+    parser.add_argument("--skip-target-language", action="store_true",
+                        help="Skip segments that are already in the target language")
+    parser.add_argument("--profile-run", choices=list(RunProfiler.MODES),
+                        help="Profile each translated file with cProfile or sampled stacks of all threads, "
+                             "saving <output>.prof or <output>.folded")
+    parser.add_argument("--profile-top", type=int, default=RunProfiler.TOP,
+                        help=f"Functions shown in the profile summary (default: {RunProfiler.TOP})")
+    add_profile_arguments(parser)
+
+
+def add_profile_arguments(parser):
+    """Add the model runtime options"""
+    parser.add_argument("--profile", default="default", choices=list(PerformanceProfile.PRESETS.keys()),
+                        help="Model runtime profile (default: Argos defaults)")
+    parser.add_argument("--inter-threads", type=int, help="Override CTranslate2 inter_threads")
+    parser.add_argument("--intra-threads", type=int, help="Override CTranslate2 intra_threads (0 = auto)")
+    parser.add_argument("--compute-type", help="Override CTranslate2 compute type (e.g. int8, float32)")
+    parser.add_argument("--beam-size", type=int, help="Override beam size")
+    parser.add_argument("--max-decoding-length", type=int, help="Override maximum decoding length")
+
+
+def worker_setting(value):
+    """Parse a positive count or 'auto'"""
+    if value == WorkerTuning.AUTO:
+        return value
+    try:
+        count = int(value)
+    except ValueError:
+        count = 0
+    if count < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive number or '{WorkerTuning.AUTO}', got '{value}'")
+    return count
+
+
+def profile_from_args(args, name=None):
+    """Build a performance profile from parsed command line options"""
+    return PerformanceProfile.get(
+        name or args.profile,
+        inter_threads=args.inter_threads,
+        intra_threads=args.intra_threads,
+        compute_type=args.compute_type,
+        beam_size=args.beam_size,
+        max_decoding_length=args.max_decoding_length
+    )
+
+
+def engine_kwargs_from_args(args, source, output, **overrides):
+    """Build engine keyword arguments from parsed command line options"""
+    kwargs = dict(
+        source_file=source,
+        output_file=output,
+        source_lang=args.source_lang,
+        target_lang=args.target_lang,
+        max_workers=args.threads,
+        batch_size=args.batch_size,
+        delay_between_requests=args.delay,
+        skip_target_language=args.skip_target_language,
+        glossary_file=args.glossary,
+        key_rules=args.keys,
+        fuzzy_threshold=args.fuzzy,
+        cache_limit_mb=args.cache_limit_mb,
+        memory_budget_mb=args.memory_budget_mb,
+        performance_profile=profile_from_args(args),
+        profiler=args.profile_run,
+        profile_top=args.profile_top
+    )
+    kwargs.update(overrides)
+    return kwargs
+
+
+def cli_translate(args):
+    """Run the translate command"""
+    output = args.output
+    if not output:
+        base, ext = os.path.splitext(args.source.rstrip('/\\'))
+        output = f"{base}_translated{ext}"
+
+    if os.path.isdir(args.source):
+        return cli_translate_directory(args, output)
+
+    if args.daemon and not args.dry_run:
+        result = DaemonClient(args.daemon).translate_file(
+            args.source, output, args.source_lang, args.target_lang, file_type=args.file_type,
+            batch_size=args.batch_size, delay_between_requests=args.delay,
+            skip_target_language=args.skip_target_language,
+            glossary_file=os.path.abspath(args.glossary) if args.glossary else None,
+            key_rules=args.keys, fuzzy_threshold=args.fuzzy, performance_profile=args.profile
+        )
+        for message in result['log']:
+            print(message)
+        return 0
+
+    file_type = args.file_type if args.file_type != "auto" else detect_file_type(args.source)
+    engine = create_translator_engine(file_type, **engine_kwargs_from_args(args, args.source, output,
+                                                                           dry_run=args.dry_run))
+    if args.dry_run:
+        engine.log_cost_estimate(engine.estimate_cost())
+    else:
+        engine.translate_file_with_profiler()
+    return 0
+
+
+def benchmark_profiles(source_file, file_type, source_lang, target_lang, profile_names, samples=200,
+                       log_callback=print):
+    """Translate the same sample with each profile and compare speed and output agreement"""
+    sampler = create_translator_engine(file_type, source_file=source_file, output_file=None,
+                                       source_lang=source_lang, target_lang=target_lang, dry_run=True)
+    segments = []
+    seen = set()
+    for text in sampler.iter_source_texts():
+        if sampler.should_ignore(text):
+            continue
+        for part, needs_translation in sampler.iter_segments(text):
+            part = part.strip()
+            if needs_translation and part not in seen:
+                seen.add(part)
+                segments.append(part)
+        if len(segments) >= samples:
+            break
+    segments = segments[:samples]
+    if not segments:
+        raise Exception("No translatable segments found to benchmark")
+
+    log_callback(f"Benchmarking {len(segments)} segments ({sum(map(len, segments))} chars), "
+                 f"{source_lang} -> {target_lang}")
+
+    results = {}
+    for name in profile_names:
+        profile = PerformanceProfile.get(name)
+        # The model is called directly so the shared cache cannot skew the comparison
+        engine = create_translator_engine(file_type, source_file=source_file, output_file=None,
+                                          source_lang=source_lang, target_lang=target_lang,
+                                          performance_profile=profile, log_callback=log_callback)
+        engine.translation_engine.translate(segments[0])  # Load the model before timing
+
+        started = time.perf_counter()
+        outputs = [engine.translation_engine.translate(segment) for segment in segments]
+        elapsed = time.perf_counter() - started
+        results[name] = {'seconds': elapsed, 'outputs': outputs}
+
+    # Agreement with the slowest/highest-quality profile is a rough quality proxy
+    reference = 'quality' if 'quality' in results else profile_names[-1]
+    for name in profile_names:
+        result = results[name]
+        agreement = sum(
+            difflib.SequenceMatcher(None, output, reference_output).ratio()
+            for output, reference_output in zip(result['outputs'], results[reference]['outputs'])
+        ) / len(segments)
+        log_callback(f"{name:>12}: {result['seconds']:.2f}s, {len(segments) / result['seconds']:.1f} segments/s, "
+                     f"{agreement * 100:.1f}% agreement with {reference}")
+
+    for index in range(min(3, len(segments))):
+        log_callback(f"Sample: {segments[index]}")
+        for name in profile_names:
+            log_callback(f"  {name:>12}: {results[name]['outputs'][index]}")
+
+    return results
+
+
+def benchmark_segment_memory(segments=1000000, log_callback=print):
+    """Measure the peak memory of a pipeline pass over a synthetic corpus of the given number of segments"""
+    # Every line has six segments: color code, text, placeholder, text, placeholder, text
+    lines = max(1, segments // 6)
+    rng = random.Random(0)
+    words = [f"word{i}" for i in range(5000)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = os.path.join(directory, 'corpus.properties')
+        with open(source, 'w', encoding='utf-8') as f:
+            for i in range(lines):
+                first = ' '.join(rng.choice(words) for _ in range(3))
+                second = ' '.join(rng.choice(words) for _ in range(2))
+                f.write(f"key.{i}=&a{first} %player%! {second} have {{amount}} {rng.choice(words)} coins\n")
+
+        # A dry run exercises every pipeline stage except the model itself
+        engine = create_translator_engine('properties', source_file=source,
+                                          output_file=os.path.join(directory, 'output.properties'),
+                                          source_lang='en', target_lang='id', dry_run=True,
+                                          delay_between_requests=0, log_callback=lambda message: None)
+        tracemalloc.start()
+        try:
+            started = time.perf_counter()
+            engine.translate_file()
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    log_callback(f"{lines * 6} segments in {lines} lines: peak traced memory {peak / (1024 * 1024):.1f} MB, "
+                 f"{elapsed:.1f}s with tracing")
+    return {'segments': lines * 6, 'peak_bytes': peak, 'seconds': elapsed}
+
+
+REGRESSION_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'regression')
+
+
+class StubTranslation:
+    """Deterministic stand-in for an Argos translation, used by the regression harness"""
+
+    def translate(self, text):
+        # Every word is reversed, so a color code or placeholder that reaches the model shows in the output
+        return ' '.join(word[::-1] for word in text.split(' '))
+
+
+def protected_tokens(text):
+    """Color codes, placeholders, IDs and commands that have to leave a translation exactly as they went in"""
+    # The engine's own split pattern, so the check covers exactly what the engine promises to keep
+    return sorted(BaseTranslatorEngine.SPLIT_PATTERN.findall(text))
+
+
+def compare_yaml_structure(source, output, path=""):
+    """List the places where two YAML documents differ in keys, list lengths, non-string values or tokens"""
+    problems = []
+    if isinstance(source, dict):
+        if not isinstance(output, dict) or list(source) != list(output):
+            return [f"{path or '/'}: keys differ"]
+        for key in source:
+            problems += compare_yaml_structure(source[key], output[key], f"{path}.{key}" if path else str(key))
+    elif isinstance(source, list):
+        if not isinstance(output, list) or len(source) != len(output):
+            return [f"{path}: list length differs"]
+        for index, (source_item, output_item) in enumerate(zip(source, output)):
+            problems += compare_yaml_structure(source_item, output_item, f"{path}[{index}]")
+    elif isinstance(source, str):
+        if not isinstance(output, str):
+            problems.append(f"{path}: no longer a string")
+        elif protected_tokens(source) != protected_tokens(output):
+            problems.append(f"{path}: color codes, placeholders, IDs or commands changed in {output!r}")
+    elif source != output:
+        problems.append(f"{path}: {source!r} changed to {output!r}")
+    return problems
+
+
+def read_properties_entries(path):
+    """Read (key, protected tokens) for every key=value line of a properties file"""
+    entries = []
+    with open(path, 'r', encoding=detect_encoding(path)) as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(('#', '!')) and '=' in line:
+                value = PropertiesTranslatorEngine.line_value(line) or ''
+                entries.append((PropertiesTranslatorEngine.line_key(line), protected_tokens(value)))
+    return entries
+
+
+def check_translated_structure(source, output, file_type):
+    """Check that a translation kept the structure, color codes and placeholders of its source"""
+    if file_type == 'yaml':
+        with open(source, 'r', encoding=detect_encoding(source)) as f:
+            source_data = yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+        with open(output, 'r', encoding='utf-8') as f:
+            return compare_yaml_structure(source_data, yaml.load(f, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)))
+
+    source_entries = read_properties_entries(source)
+    output_entries = read_properties_entries(output)
+    if [key for key, _ in source_entries] != [key for key, _ in output_entries]:
+        return ["keys differ"]
+    return [f"{key}: color codes, placeholders, IDs or commands changed to {output_tokens}"
+            for (key, source_tokens), (_, output_tokens) in zip(source_entries, output_entries)
+            if source_tokens != output_tokens]
+
+
+def describe_difference(expected, produced):
+    """Describe the first line where produced bytes differ from the expected bytes"""
+    pairs = itertools.zip_longest(expected.splitlines(keepends=True), produced.splitlines(keepends=True))
+    for number, (expected_line, produced_line) in enumerate(pairs, 1):
+        if expected_line != produced_line:
+            return f"line {number} differs from golden: expected {expected_line!r}, got {produced_line!r}"
+    return "differs from golden"
+
+
+def run_regression_fixture(source, output, file_type, glossary_file=None, memory_map=False, trace=False,
+                           key_rules=None):
+    """Translate one fixture with the stub; returns seconds, peak traced bytes, retained blocks and model calls"""
+    # Every run starts cold, so runs do the same work
+    TranslationCache.shared().clear()
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    if trace:
+        tracemalloc.start()
+    try:
+        engine = create_translator_engine(file_type, source_file=source, output_file=output, source_lang='en',
+                                          target_lang='xx', max_workers=2, batch_size=5, delay_between_requests=0,
+                                          glossary_file=glossary_file, key_rules=key_rules,
+                                          log_callback=lambda message: None, translation_engine=StubTranslation())
+        # A stub run is not a model throughput measurement
+        engine.record_throughput = lambda seconds: None
+        if memory_map:
+            engine.MMAP_THRESHOLD = 0
+        started = time.perf_counter()
+        engine.translate_file()
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    finally:
+        if trace:
+            tracemalloc.stop()
+
+    model_calls = engine.model_calls
+    del engine
+    TranslationCache.shared().clear()
+    gc.collect()
+    return elapsed, peak, sys.getallocatedblocks() - blocks_before, model_calls
+
+
+def run_regression(directory=None, update=False, repeat=5, baseline=None, tolerance=0.25, report=None,
+                   log_callback=print):
+    """Translate every fixture with a deterministic stub, compare with golden outputs and record speed and memory"""
+    directory = directory or REGRESSION_DIR
+    fixtures_dir = os.path.join(directory, 'fixtures')
+    golden_dir = os.path.join(directory, 'golden')
+    glossary_file = os.path.join(directory, 'glossary.txt')
+    if not os.path.exists(glossary_file):
+        glossary_file = None
+
+    try:
+        fixtures = [name for name in sorted(os.listdir(fixtures_dir))
+                    if os.path.splitext(name)[1].lower() in TRANSLATABLE_EXTENSIONS]
+    except OSError as e:
+        raise Exception(f"Failed to read fixtures: {e}")
+    if not fixtures:
+        raise Exception(f"No fixtures found in {fixtures_dir}")
+
+    baseline_results = {}
+    if baseline:
+        try:
+            with open(baseline, 'r', encoding='utf-8') as f:
+                baseline_results = json.load(f)
+        except Exception as e:
+            raise Exception(f"Failed to read baseline: {e}")
+
+    results = {}
+    failures = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name in fixtures:
+            source = os.path.join(fixtures_dir, name)
+            golden = os.path.join(golden_dir, name)
+            file_type = detect_file_type(source)
+            # A <fixture>.keys file next to a fixture holds its key-path rules
+            key_rules = None
+            if os.path.exists(f"{source}.keys"):
+                with open(f"{source}.keys", 'r', encoding='utf-8') as f:
+                    key_rules = f.read()
+            # Properties fixtures also go through the memory-mapped path, which has to give the same bytes
+            for variant in (('text', 'mmap') if file_type == 'properties' else ('text',)):
+                key = f"{name}:{variant}"
+                output = os.path.join(temp_dir, f"{variant}-{name}")
+                memory_map = variant == 'mmap'
+                problems = []
+                try:
+                    # The first run is traced for memory, the others are timed without tracing overhead
+                    seconds, peak, retained, model_calls = run_regression_fixture(
+                        source, output, file_type, glossary_file, memory_map, trace=True, key_rules=key_rules)
+                    seconds = min(run_regression_fixture(source, output, file_type, glossary_file, memory_map,
+                                                         key_rules=key_rules)[0]
+                                  for _ in range(max(1, repeat)))
+                    with open(output, 'rb') as f:
+                        produced = f.read()
+                    problems += check_translated_structure(source, output, file_type)
+                except Exception as e:
+                    log_callback(f"FAIL {key}: {e}")
+                    failures += 1
+                    continue
+
+                if update and not memory_map:
+                    os.makedirs(golden_dir, exist_ok=True)
+                    with AtomicOutput(golden) as f:
+                        f.write(produced)
+                elif not os.path.exists(golden):
+                    problems.append("no golden output yet, run with --update")
+                else:
+                    with open(golden, 'rb') as f:
+                        expected = f.read()
+                    if produced != expected:
+                        problems.append(describe_difference(expected, produced))
+
+                size = os.path.getsize(source)
+                result = results[key] = {
+                    'seconds': seconds,
+                    'kb_per_second': size / 1024 / seconds if seconds else 0,
+                    'peak_kb': peak / 1024,
+                    'retained_blocks': retained,
+                    'model_calls': model_calls,
+                }
+                base = baseline_results.get(key)
+                # Differences below a millisecond or 16 KB are noise on fixtures this small
+                if base and seconds > base['seconds'] * (1 + tolerance) and seconds - base['seconds'] > 0.001:
+                    problems.append(f"slower than baseline: {seconds * 1000:.2f} ms vs {base['seconds'] * 1000:.2f} ms")
+                if (base and result['peak_kb'] > base['peak_kb'] * (1 + tolerance) and
+                        result['peak_kb'] - base['peak_kb'] > 16):
+                    problems.append(f"more memory than baseline: peak {result['peak_kb']:.0f} KB "
+                                    f"vs {base['peak_kb']:.0f} KB")
+
+                failures += bool(problems)
+                log_callback(f"{'FAIL' if problems else 'ok':<4} {key:<36} {seconds * 1000:8.2f} ms "
+                             f"{result['kb_per_second']:8.0f} KB/s  peak {result['peak_kb']:6.0f} KB  "
+                             f"retained {retained:5} blocks  {model_calls} model calls")
+                for problem in problems:
+                    log_callback(f"       {problem}")
+
+    if report:
+        with AtomicOutput(report, 'utf-8') as f:
+            f.write(json.dumps(results, indent=2))
+        log_callback(f"Results saved to {report}")
+    if update:
+        log_callback(f"Golden outputs updated in {golden_dir}")
+    log_callback(f"{len(results)} fixture runs, {failures} failed")
+    return failures
+
+
+def cli_translate_directory(args, output_dir):
+    """Translate every properties/YAML file under a directory"""
+    pairs = collect_translatable_files(args.source, output_dir)
+    print(f"Found {len(pairs)} files in {args.source}")
+
+    failures = 0
+    # Small outputs are written on a background thread so disk I/O never holds up translation
+    writer = None if args.dry_run else OutputWriter(log_callback=lambda message: print(message, file=sys.stderr))
+    for source, output in pairs:
+        try:
+            file_type = args.file_type if args.file_type != "auto" else detect_file_type(source)
+            if args.daemon and not args.dry_run:
+                DaemonClient(args.daemon).translate_file(source, output, args.source_lang, args.target_lang,
+                                                         file_type=file_type, batch_size=args.batch_size,
+                                                         delay_between_requests=args.delay, key_rules=args.keys)
+                print(f"Translated {source}")
+                continue
+
+            engine = create_translator_engine(file_type, **engine_kwargs_from_args(
+                args, source, output, dry_run=args.dry_run, log_callback=lambda message: None,
+                output_writer=writer))
+            if args.dry_run:
+                engine.log_callback = print
+                engine.log_cost_estimate(engine.estimate_cost())
+            else:
+                engine.translate_file_with_profiler()
+                print(f"Translated {source}")
+        except Exception as e:
+            failures += 1
+            print(f"Failed to translate {source}: {e}", file=sys.stderr)
+
+    if writer is not None:
+        try:
+            writer.close()
+        except Exception as e:
+            failures += 1
+            print(e, file=sys.stderr)
+
+    return 1 if failures else 0
+
+
+def cli_benchmark(args):
+    """Run the benchmark command"""
+    file_type = args.file_type if args.file_type != "auto" else detect_file_type(args.source)
+    profile_names = [name.strip() for name in args.profiles.split(',') if name.strip()]
+    benchmark_profiles(args.source, file_type, args.source_lang, args.target_lang, profile_names, args.samples)
+    return 0
+
+
+def cli_benchmark_memory(args):
+    """Run the memory benchmark command"""
+    benchmark_segment_memory(args.segments)
+    return 0
+
+
+def cli_regress(args):
+    """Run the regression command"""
+    failures = run_regression(args.directory, args.update, args.repeat, args.baseline, args.tolerance, args.report)
+    return 1 if failures else 0
+
+
+def cli_watch(args):
+    """Run the watch command"""
+    def log(message):
+        print(f"[{time.strftime('%H:%M:%S')}] {message}")
+
+    engine_kwargs = engine_kwargs_from_args(args, None, None)
+    for key in ('source_file', 'output_file'):
+        engine_kwargs.pop(key)
+
+    session = WatchSession(args.sources, args.output, engine_kwargs, file_type=args.file_type,
+                           debounce=args.debounce, log_callback=log, use_inotify=not args.poll)
+    try:
+        session.run()
+    except KeyboardInterrupt:
+        log("Watch stopped")
+    return 0
+
+
+def cli_plan(args):
+    """Run the plan command"""
+    target_langs = [lang.strip() for lang in args.target_langs.split(',') if lang.strip()]
+    engine_options = {'glossary_file': os.path.abspath(args.glossary)} if args.glossary else {}
+    if args.keys:
+        engine_options['key_rules'] = args.keys
+    ShardPlan.create(args.inputs, args.plan_dir, args.output, args.source_lang, target_langs, args.shards,
+                     file_type=args.file_type, engine_options=engine_options)
+    return 0
+
+
+def cli_shard(args):
+    """Run the shard command"""
+    plan = ShardPlan.load(args.plan_dir)
+    target_langs = ([lang.strip() for lang in args.target_langs.split(',') if lang.strip()]
+                    if args.target_langs else plan.data['target_langs'])
+
+    if args.all:
+        extra_args = ['--threads', str(args.threads), '--batch-size', str(args.batch_size), '--profile', args.profile]
+        for option in ('inter_threads', 'intra_threads', 'compute_type', 'beam_size', 'max_decoding_length'):
+            if getattr(args, option) is not None:
+                extra_args += [f"--{option.replace('_', '-')}", str(getattr(args, option))]
+        if args.memory_budget_mb:
+            extra_args += ['--memory-budget-mb', str(max(1, args.memory_budget_mb // args.processes))]
+        return 1 if plan.run_local(target_langs, args.processes, extra_args) else 0
+
+    if not 0 <= args.shard < len(plan.data['shards']):
+        raise Exception(f"Shard index must be between 0 and {len(plan.data['shards']) - 1}")
+    engine_kwargs = dict(max_workers=args.threads, batch_size=args.batch_size, delay_between_requests=0,
+                         memory_budget_mb=args.memory_budget_mb, performance_profile=profile_from_args(args))
+    for lang in target_langs:
+        plan.translate_shard(args.shard, lang, engine_kwargs)
+    return 0
+
+
+def cli_merge(args):
+    """Run the merge command"""
+    ShardPlan.load(args.plan_dir).merge()
+    return 0
+
+
+def cli_daemon(args):
+    """Run the daemon command"""
+    if args.cache_limit_mb:
+        TranslationCache.shared().resize(args.cache_limit_mb * 1024 * 1024)
+    if args.memory_budget_mb:
+        ModelRegistry.shared().set_memory_budget(args.memory_budget_mb)
+
+    daemon = TranslationDaemon(args.address, max_workers=args.threads, allowed_roots=args.root,
+                               default_options={'glossary_file': args.glossary, 'key_rules': args.keys,
+                                                'performance_profile': profile_from_args(args)})
+    for pair in filter(None, (pair.strip() for pair in args.preload.split(','))):
+        source_lang, _, target_lang = pair.partition(':')
+        daemon.preload(source_lang, target_lang)
+
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.log("Daemon stopped")
+    return 0
+
+
+def run_cli(argv):
+    """Run the command line interface"""
+    args = build_arg_parser().parse_args(argv)
+    commands = {
+        "translate": cli_translate,
+        "benchmark": cli_benchmark,
+        "benchmark-memory": cli_benchmark_memory,
+        "regress": cli_regress,
+        "daemon": cli_daemon,
+        "watch": cli_watch,
+        "plan": cli_plan,
+        "shard": cli_shard,
+        "merge": cli_merge,
+    }
+    try:
+        return commands[args.command](args)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
 
 
 def main():
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     try:
         # Check if PyYAML is available
         import yaml